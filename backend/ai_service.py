@@ -6,8 +6,16 @@ Adapted from CLI version for Flask backend integration
 """
 
 import requests
+from bisect import bisect_right
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
+import json
 import os
+import threading
+import time
+from types import MappingProxyType
+from cachetools import TTLCache
 from dotenv import load_dotenv
 from database import get_db_connection
 from services import HabitService, TaskService, StatsService
@@ -19,14 +27,145 @@ load_dotenv()
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")
 OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
+ANTHROPIC_BASE_URL = "https://api.anthropic.com/v1"
 # Prefer env override; fall back to a cheaper, widely accessible model
 DEFAULT_AI_MODEL = os.getenv("DEFAULT_AI_MODEL", "anthropic/claude-3-haiku")
 AI_ASSISTANT_NAME = "HabBot"
 AI_PERSONALITY = "encouraging, motivational, and insightful"
 
+# System prompts depend only on the constants above, so build them once
+_SYSTEM_GREETING = (
+    f"You are {AI_ASSISTANT_NAME}, a {AI_PERSONALITY} AI assistant for habit tracking.\n"
+    "Keep responses warm, concise (2-3 sentences), and motivational. Perfect for web dashboard greeting."
+)
+_SYSTEM_INSIGHTS = (
+    f"You are {AI_ASSISTANT_NAME}, providing habit insights for a web dashboard.\n"
+    "Be encouraging but honest. Give 1-2 specific, actionable suggestions. Keep under 60 words."
+)
+_SYSTEM_PRIORITIZE = (
+    f"You are {AI_ASSISTANT_NAME}, helping with task prioritization for a web app.\n"
+    "Suggest which tasks to tackle first. Be concise and practical. Keep under 50 words."
+)
+_SYSTEM_SUGGEST = (
+    f"You are {AI_ASSISTANT_NAME}, suggesting complementary habits for a web app.\n"
+    "Suggest ONE specific, small habit. Keep under 50 words and be actionable."
+)
+_SYSTEM_DASHBOARD = (
+    f"You are {AI_ASSISTANT_NAME}, a {AI_PERSONALITY} AI assistant for a habit tracking web dashboard.\n"
+    'Reply as strict JSON with the string keys "greeting", "insights" and "prioritization", each under 40 words. No other text.'
+)
+_SYSTEM_MOTIVATE = (
+    f"You are {AI_ASSISTANT_NAME}, providing motivation for a web app.\n"
+    "Keep it under 30 words, uplifting, and specific to the context."
+)
+_SYSTEM_WEEKLY = (
+    f"You are {AI_ASSISTANT_NAME}, providing a weekly summary for a web dashboard.\n"
+    "Be celebratory and encouraging. Keep under 60 words."
+)
+_SYSTEM_EVENING = (
+    f"You are {AI_ASSISTANT_NAME}, providing an evening reflection message.\n"
+    "Be reflective and prepare them for tomorrow. Keep under 40 words."
+)
+
 # Use shared DB connection from backend.database to avoid duplicate DB paths
 
 
+def _build_session(host: str, headers: dict) -> requests.Session:
+    """Create a keep-alive session with a pooled, retrying adapter for one AI host"""
+    # Completions are billed POSTs: retry only on statuses that mean the request
+    # was not processed, never after a connect or read timeout
+    retries = Retry(
+        total=2,
+        connect=0,
+        read=0,
+        backoff_factor=0.3,
+        status_forcelist=[429, 503],
+        allowed_methods=frozenset({"GET", "POST"}),
+        # Back off briefly instead of sleeping out an uncapped Retry-After
+        respect_retry_after_header=False,
+        raise_on_status=False,  # Hand the final response to _friendly_error
+    )
+    session = requests.Session()
+    session.mount(
+        host, HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=retries)
+    )
+    session.headers.update(headers)
+    return session
+
+
+# Request headers are fixed once the keys are loaded; sessions send them by default
+_OPENROUTER_HEADERS = MappingProxyType(
+    {
+        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+        "Content-Type": "application/json",
+        "HTTP-Referer": "https://github.com/yourusername/habit-tracker-web",
+        "X-Title": "Habit & Task Tracker Web AI",
+    }
+)
+_ANTHROPIC_HEADERS = MappingProxyType(
+    {
+        "x-api-key": ANTHROPIC_API_KEY,
+        "Content-Type": "application/json",
+        "anthropic-version": "2023-06-01",
+    }
+)
+
+# One session per provider so TCP/TLS connections are reused across AI calls
+_OPENROUTER_SESSION = _build_session("https://openrouter.ai", _OPENROUTER_HEADERS)
+_ANTHROPIC_SESSION = _build_session("https://api.anthropic.com", _ANTHROPIC_HEADERS)
+
+# Short-lived cache for AI text whose inputs only change a few times per hour
+_AI_CACHE = TTLCache(maxsize=256, ttl=300)
+_AI_CACHE_LOCK = threading.Lock()
+# Leading markers of the error strings below; those responses are never cached
+_AI_ERROR_PREFIXES = ("❌", "💳", "⏳", "🚧")
+
+_NO_HABITS_MESSAGE = "💡 Ready to start your habit journey? Add your first habit to begin building an amazing routine!"
+_NO_PENDING_TASKS_MESSAGE = "🎉 No pending tasks for today! Perfect time to work on your habits or plan ahead."
+_DASHBOARD_KEYS = ("greeting", "insights", "prioritization")
+# Offline messages for each dashboard panel when its completion fails
+_GREETING_FALLBACK = "Good {}! Ready to build some amazing habits today? 🌟"
+_INSIGHTS_FALLBACK = "📊 Great habits take time to build. Focus on consistency over perfection!"
+_PRIORITIZE_FALLBACK = "📋 Tackle your most important task first - you've got this!"
+
+# Streak lines for AI prompts: _STREAK_TEMPLATES[i] covers streaks from
+# _STREAK_THRESHOLDS[i - 1] up to the next threshold
+_STREAK_THRESHOLDS = (1, 3, 7)
+_STREAK_TEMPLATES = (
+    "⭕ {}: needs attention",
+    "🌱 {}: {}-day streak (good start)",
+    "💪 {}: {}-day streak (building momentum)",
+    "🔥 {}: {}-day streak (excellent!)",
+)
+
+# Greeting period for each hour of the day (0-23)
+_TIME_OF_DAY = ("morning",) * 12 + ("afternoon",) * 5 + ("evening",) * 7
+
+# Motivation prompts and offline fallbacks, keyed by the caller's context
+_MOTIVATE_PROMPTS = MappingProxyType(
+    {
+        "new_habit": "The user just added a new habit. Provide encouraging words for starting strong.",
+        "habit_completed": "The user just completed a habit. Celebrate and encourage consistency.",
+        "task_completed": "The user completed a task. Celebrate their productivity.",
+        "streak_broken": "A habit streak was broken. Provide encouraging words about getting back on track.",
+        "general": "Provide a general motivational message about building good habits.",
+    }
+)
+_FALLBACK_MESSAGES = MappingProxyType(
+    {
+        "new_habit": "Great choice! Start small and stay consistent - you've got this! 🌟",
+        "habit_completed": "Awesome work! Every day you stick to your habits, you're becoming stronger! 💪",
+        "task_completed": "Task completed! You're making great progress today! ✨",
+        "streak_broken": "No worries! Every expert was once a beginner. Tomorrow is a fresh start! 🌅",
+        "general": "Small consistent actions lead to remarkable results. Keep going! 🚀",
+    }
+)
+
+# Last successful health check, reused for a minute so probes don't spend tokens
+_HEALTH_CACHE = {"at": 0.0, "result": None}
+_HEALTH_CACHE_TTL = 60
+
+
 def _friendly_error(status_code: int) -> str:
     if status_code == 401:
         return "❌ AI is disabled: invalid or missing API key. Add your key in .env and restart."
@@ -52,31 +191,50 @@ def call_ai_api(prompt: str, system_prompt: str = None) -> str:
         return f"❌ AI service unavailable: {str(e)}"
 
 
-def call_openrouter(prompt: str, system_prompt: str = None) -> str:
-    """Call OpenRouter API"""
-    headers = {
-        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-        "Content-Type": "application/json",
-        "HTTP-Referer": "https://github.com/yourusername/habit-tracker-web",
-        "X-Title": "Habit & Task Tracker Web AI",
-    }
+def _cached_ai_call(key: tuple, prompt: str, system_prompt: str = None) -> str:
+    """call_ai_api with a TTL cache keyed on the inputs that shaped the prompt"""
+    with _AI_CACHE_LOCK:
+        cached = _AI_CACHE.get(key)
+    if cached is not None:
+        return cached
 
-    messages = []
-    if system_prompt:
-        messages.append({"role": "system", "content": system_prompt})
-    messages.append({"role": "user", "content": prompt})
+    response = call_ai_api(prompt, system_prompt)
+    if not response.startswith(_AI_ERROR_PREFIXES):
+        with _AI_CACHE_LOCK:
+            _AI_CACHE[key] = response
+    return response
 
-    data = {
+
+def _openrouter_payload(prompt: str, system_prompt: str = None) -> dict:
+    """Build the OpenRouter chat completion request body"""
+    user = {"role": "user", "content": prompt}
+    return {
         "model": DEFAULT_AI_MODEL,
-        "messages": messages,
+        "messages": (
+            [{"role": "system", "content": system_prompt}, user]
+            if system_prompt
+            else [user]
+        ),
         "max_tokens": 300,
         "temperature": 0.7,
     }
 
-    response = requests.post(
+
+def _anthropic_payload(prompt: str, system_prompt: str = None) -> dict:
+    """Build the Anthropic messages request body"""
+    return {
+        "model": "claude-3-sonnet-20240229",
+        "max_tokens": 300,
+        **({"system": system_prompt} if system_prompt else {}),
+        "messages": [{"role": "user", "content": prompt}],
+    }
+
+
+def call_openrouter(prompt: str, system_prompt: str = None) -> str:
+    """Call OpenRouter API"""
+    response = _OPENROUTER_SESSION.post(
         f"{OPENROUTER_BASE_URL}/chat/completions",
-        headers=headers,
-        json=data,
+        json=_openrouter_payload(prompt, system_prompt),
         timeout=30,
     )
 
@@ -89,23 +247,10 @@ def call_openrouter(prompt: str, system_prompt: str = None) -> str:
 
 def call_anthropic(prompt: str, system_prompt: str = None) -> str:
     """Call direct Anthropic API"""
-    headers = {
-        "x-api-key": ANTHROPIC_API_KEY,
-        "Content-Type": "application/json",
-        "anthropic-version": "2023-06-01",
-    }
-
-    data = {
-        "model": "claude-3-sonnet-20240229",
-        "max_tokens": 300,
-        "messages": [{"role": "user", "content": prompt}],
-    }
-
-    if system_prompt:
-        data["system"] = system_prompt
-
-    response = requests.post(
-        "https://api.anthropic.com/v1/messages", headers=headers, json=data, timeout=30
+    response = _ANTHROPIC_SESSION.post(
+        f"{ANTHROPIC_BASE_URL}/messages",
+        json=_anthropic_payload(prompt, system_prompt),
+        timeout=30,
     )
 
     if response.status_code == 200:
@@ -115,15 +260,70 @@ def call_anthropic(prompt: str, system_prompt: str = None) -> str:
     return friendly
 
 
-def get_daily_greeting() -> str:
-    """Generate personalized daily greeting for web dashboard"""
+def _iter_sse_data(response):
+    """Yield the JSON payload of each `data:` frame in a server-sent events body"""
+    response.encoding = "utf-8"  # SSE is always UTF-8; requests can't infer it
+    for line in response.iter_lines(decode_unicode=True):
+        if not line or not line.startswith("data:"):
+            continue  # Blank separators, comments and `event:` lines
+        payload = line[5:].strip()
+        if payload == "[DONE]":
+            break
+        yield json.loads(payload)
+
+
+def call_openrouter_stream(prompt: str, system_prompt: str = None):
+    """Stream OpenRouter completion text as it is generated"""
+    data = _openrouter_payload(prompt, system_prompt)
+    data["stream"] = True
+
+    with _OPENROUTER_SESSION.post(
+        f"{OPENROUTER_BASE_URL}/chat/completions", json=data, timeout=30, stream=True
+    ) as response:
+        if response.status_code != 200:
+            yield _friendly_error(response.status_code)
+            return
+        for event in _iter_sse_data(response):
+            choices = event.get("choices") or [{}]
+            delta = choices[0].get("delta", {}).get("content")
+            if delta:
+                yield delta
+
+
+def call_anthropic_stream(prompt: str, system_prompt: str = None):
+    """Stream Anthropic completion text as it is generated"""
+    data = _anthropic_payload(prompt, system_prompt)
+    data["stream"] = True
+
+    with _ANTHROPIC_SESSION.post(
+        f"{ANTHROPIC_BASE_URL}/messages", json=data, timeout=30, stream=True
+    ) as response:
+        if response.status_code != 200:
+            yield _friendly_error(response.status_code)
+            return
+        for event in _iter_sse_data(response):
+            if event.get("type") == "content_block_delta":
+                delta = event.get("delta", {}).get("text")
+                if delta:
+                    yield delta
+
+
+def stream_ai_api(prompt: str, system_prompt: str = None):
+    """Streaming counterpart of call_ai_api; yields text chunks"""
     try:
-        stats = StatsService.get_daily_stats_for_ai()
+        if OPENROUTER_API_KEY:
+            yield from call_openrouter_stream(prompt, system_prompt)
+        elif ANTHROPIC_API_KEY:
+            yield from call_anthropic_stream(prompt, system_prompt)
+        else:
+            yield "❌ No AI API key configured. Please set up your API key in .env"
+    except Exception as e:
+        yield f"❌ AI service unavailable: {str(e)}"
 
-        system_prompt = f"""You are {AI_ASSISTANT_NAME}, a {AI_PERSONALITY} AI assistant for habit tracking. 
-        Keep responses warm, concise (2-3 sentences), and motivational. Perfect for web dashboard greeting."""
 
-        user_prompt = f"""Create a personalized greeting for the user's dashboard.
+def _greeting_request(stats: dict) -> tuple:
+    """Build the (cache key, user prompt) pair for the daily greeting"""
+    user_prompt = f"""Create a personalized greeting for the user's dashboard.
         
         Current status:
         - Habits completed today: {stats['habits_done_today']}/{stats['total_habits']}
@@ -134,22 +334,72 @@ def get_daily_greeting() -> str:
         
         Make it encouraging and specific to their progress. Keep it under 40 words for web display."""
 
-        return call_ai_api(user_prompt, system_prompt)
+    key = (
+        "greet",
+        stats["habits_done_today"],
+        stats["total_habits"],
+        stats["tasks_done_today"],
+        stats["total_tasks_today"],
+        stats["best_streak"],
+        stats["active_streaks"],
+        datetime.now().strftime("%Y-%m-%d-%H"),
+    )
+    return key, user_prompt
+
+
+def get_daily_greeting() -> str:
+    """Generate personalized daily greeting for web dashboard"""
+    try:
+        stats = StatsService.get_daily_stats_for_ai()
+        key, user_prompt = _greeting_request(stats)
+        return _cached_ai_call(key, user_prompt, _SYSTEM_GREETING)
 
     except Exception as e:
         # Fallback greeting if AI fails
-        return f"Good {get_time_of_day()}! Ready to build some amazing habits today? 🌟"
+        return _GREETING_FALLBACK.format(get_time_of_day())
+
+
+def stream_daily_greeting():
+    """Yield the daily greeting in chunks as the model produces it"""
+    chunks = []
+    try:
+        stats = StatsService.get_daily_stats_for_ai()
+        key, user_prompt = _greeting_request(stats)
+
+        with _AI_CACHE_LOCK:
+            cached = _AI_CACHE.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        for chunk in stream_ai_api(user_prompt, _SYSTEM_GREETING):
+            chunks.append(chunk)
+            yield chunk
+
+        greeting = "".join(chunks)
+        if greeting and not greeting.startswith(_AI_ERROR_PREFIXES):
+            with _AI_CACHE_LOCK:
+                _AI_CACHE[key] = greeting
+
+    except Exception as e:
+        # Only fall back if nothing has been sent to the client yet
+        if not chunks:
+            yield _GREETING_FALLBACK.format(get_time_of_day())
 
 
 def get_time_of_day() -> str:
     """Get appropriate time greeting"""
-    hour = datetime.now().hour
-    if hour < 12:
-        return "morning"
-    elif hour < 17:
-        return "afternoon"
-    else:
-        return "evening"
+    return _TIME_OF_DAY[datetime.now().hour]
+
+
+def _analyze_streaks(habits) -> list:
+    """Describe each habit's streak as one line for AI prompts"""
+    return [
+        _STREAK_TEMPLATES[bisect_right(_STREAK_THRESHOLDS, habit["streak"])].format(
+            habit["name"], habit["streak"]
+        )
+        for habit in habits
+    ]
 
 
 def get_habit_insights() -> str:
@@ -158,27 +408,9 @@ def get_habit_insights() -> str:
         habits = StatsService.get_all_habits_for_insights()
 
         if not habits:
-            return "💡 Ready to start your habit journey? Add your first habit to begin building an amazing routine!"
-
-        # Analyze patterns
-        streak_analysis = []
-        for habit in habits:
-            name = habit["name"]
-            streak = habit["streak"]
-
-            if streak >= 7:
-                streak_analysis.append(f"🔥 {name}: {streak}-day streak (excellent!)")
-            elif streak >= 3:
-                streak_analysis.append(
-                    f"💪 {name}: {streak}-day streak (building momentum)"
-                )
-            elif streak == 0:
-                streak_analysis.append(f"⭕ {name}: needs attention")
-            else:
-                streak_analysis.append(f"🌱 {name}: {streak}-day streak (good start)")
-
-        system_prompt = f"""You are {AI_ASSISTANT_NAME}, providing habit insights for a web dashboard.
-        Be encouraging but honest. Give 1-2 specific, actionable suggestions. Keep under 60 words."""
+            return _NO_HABITS_MESSAGE
+
+        streak_analysis = _analyze_streaks(habits)
 
         user_prompt = f"""Analyze these habit patterns and provide brief insights:
         
@@ -186,12 +418,10 @@ def get_habit_insights() -> str:
         
         Provide encouraging analysis and 1 specific suggestion for improvement."""
 
-        return call_ai_api(user_prompt, system_prompt)
+        return call_ai_api(user_prompt, _SYSTEM_INSIGHTS)
 
     except Exception as e:
-        return (
-            "📊 Great habits take time to build. Focus on consistency over perfection!"
-        )
+        return _INSIGHTS_FALLBACK
 
 
 def get_task_prioritization() -> str:
@@ -200,10 +430,7 @@ def get_task_prioritization() -> str:
         pending_tasks = StatsService.get_pending_tasks()
 
         if not pending_tasks:
-            return "🎉 No pending tasks for today! Perfect time to work on your habits or plan ahead."
-
-        system_prompt = f"""You are {AI_ASSISTANT_NAME}, helping with task prioritization for a web app.
-        Suggest which tasks to tackle first. Be concise and practical. Keep under 50 words."""
+            return _NO_PENDING_TASKS_MESSAGE
 
         task_list = "\n".join([f"- {task['name']}" for task in pending_tasks])
 
@@ -213,10 +440,10 @@ def get_task_prioritization() -> str:
         
         Suggest which 1-2 tasks to focus on first and briefly why."""
 
-        return call_ai_api(user_prompt, system_prompt)
+        return call_ai_api(user_prompt, _SYSTEM_PRIORITIZE)
 
     except Exception as e:
-        return "📋 Tackle your most important task first - you've got this!"
+        return _PRIORITIZE_FALLBACK
 
 
 def suggest_new_habit() -> str:
@@ -224,9 +451,6 @@ def suggest_new_habit() -> str:
     try:
         existing_habit_names = StatsService.get_existing_habit_names()
 
-        system_prompt = f"""You are {AI_ASSISTANT_NAME}, suggesting complementary habits for a web app.
-        Suggest ONE specific, small habit. Keep under 50 words and be actionable."""
-
         if existing_habit_names:
             habits_list = ", ".join(existing_habit_names)
             user_prompt = f"""Based on these existing habits: {habits_list}
@@ -235,44 +459,87 @@ def suggest_new_habit() -> str:
         else:
             user_prompt = "Suggest ONE simple, beginner-friendly habit for someone just starting their habit-building journey."
 
-        return call_ai_api(user_prompt, system_prompt)
+        key = ("suggest", tuple(sorted(existing_habit_names)))
+        return _cached_ai_call(key, user_prompt, _SYSTEM_SUGGEST)
 
     except Exception as e:
         return "💡 Try starting with 'Drink a glass of water when you wake up' - simple and effective!"
 
 
+def _parse_dashboard_bundle(text: str) -> dict:
+    """Extract the {greeting, insights, prioritization} object from a model reply"""
+    # Models sometimes wrap JSON in prose or code fences; keep the outermost object
+    start, end = text.find("{"), text.rfind("}")
+    data = json.loads(text[start : end + 1])
+    if not all(isinstance(data.get(key), str) for key in _DASHBOARD_KEYS):
+        raise ValueError("AI reply is missing dashboard keys")
+    return {key: data[key].strip() for key in _DASHBOARD_KEYS}
+
+
+def get_dashboard_bundle() -> dict:
+    """Generate greeting, insights and task priorities with a single AI completion"""
+    habits = pending_tasks = None
+    try:
+        stats = StatsService.get_daily_stats_for_ai()
+        habits = StatsService.get_all_habits_for_insights()
+        pending_tasks = StatsService.get_pending_tasks()
+
+        streak_lines = "\n".join(_analyze_streaks(habits)) or "No habits yet."
+        task_list = "\n".join(f"- {task['name']}" for task in pending_tasks) or "No pending tasks."
+
+        user_prompt = f"""Write the three dashboard messages.
+
+        greeting - warm and specific to today's progress:
+        - Habits completed today: {stats['habits_done_today']}/{stats['total_habits']}
+        - Tasks completed today: {stats['tasks_done_today']}/{stats['total_tasks_today']}
+        - Best current streak: {stats['best_streak']} days
+        - Active habit streaks: {stats['active_streaks']}
+        - Day: {datetime.now().strftime('%A')}
+
+        insights - encouraging analysis of these habit streaks with 1 specific suggestion:
+        {streak_lines}
+
+        prioritization - which 1-2 of these pending tasks to tackle first and briefly why:
+        {task_list}"""
+
+        key = (
+            "dashboard",
+            tuple(sorted(stats.items())),
+            streak_lines,
+            task_list,
+            datetime.now().strftime("%Y-%m-%d-%H"),
+        )
+        response = _cached_ai_call(key, user_prompt, _SYSTEM_DASHBOARD)
+        if response.startswith(_AI_ERROR_PREFIXES):
+            # Show the provider error in every panel, as the per-panel routes do
+            bundle = dict.fromkeys(_DASHBOARD_KEYS, response)
+        else:
+            bundle = _parse_dashboard_bundle(response)
+
+    except Exception as e:
+        # Unparseable reply or stats error: offline messages rather than
+        # spending three more completions on the per-panel helpers
+        bundle = {
+            "greeting": _GREETING_FALLBACK.format(get_time_of_day()),
+            "insights": _INSIGHTS_FALLBACK,
+            "prioritization": _PRIORITIZE_FALLBACK,
+        }
+
+    if habits is not None and not habits:
+        bundle["insights"] = _NO_HABITS_MESSAGE
+    if pending_tasks is not None and not pending_tasks:
+        bundle["prioritization"] = _NO_PENDING_TASKS_MESSAGE
+    return bundle
+
+
 def get_motivational_message(context: str = "general") -> str:
     """Get contextual motivational message for web interface"""
-    system_prompt = f"""You are {AI_ASSISTANT_NAME}, providing motivation for a web app.
-    Keep it under 30 words, uplifting, and specific to the context."""
-
-    if context == "new_habit":
-        user_prompt = "The user just added a new habit. Provide encouraging words for starting strong."
-    elif context == "habit_completed":
-        user_prompt = (
-            "The user just completed a habit. Celebrate and encourage consistency."
-        )
-    elif context == "task_completed":
-        user_prompt = "The user completed a task. Celebrate their productivity."
-    elif context == "streak_broken":
-        user_prompt = "A habit streak was broken. Provide encouraging words about getting back on track."
-    else:
-        user_prompt = (
-            "Provide a general motivational message about building good habits."
-        )
+    user_prompt = _MOTIVATE_PROMPTS.get(context, _MOTIVATE_PROMPTS["general"])
 
     try:
-        return call_ai_api(user_prompt, system_prompt)
+        return call_ai_api(user_prompt, _SYSTEM_MOTIVATE)
     except:
-        # Fallback messages
-        fallback_messages = {
-            "new_habit": "Great choice! Start small and stay consistent - you've got this! 🌟",
-            "habit_completed": "Awesome work! Every day you stick to your habits, you're becoming stronger! 💪",
-            "task_completed": "Task completed! You're making great progress today! ✨",
-            "streak_broken": "No worries! Every expert was once a beginner. Tomorrow is a fresh start! 🌅",
-            "general": "Small consistent actions lead to remarkable results. Keep going! 🚀",
-        }
-        return fallback_messages.get(context, fallback_messages["general"])
+        return _FALLBACK_MESSAGES.get(context, _FALLBACK_MESSAGES["general"])
 
 
 def get_weekly_summary() -> str:
@@ -280,9 +547,6 @@ def get_weekly_summary() -> str:
     try:
         stats = StatsService.get_weekly_summary_stats()
 
-        system_prompt = f"""You are {AI_ASSISTANT_NAME}, providing a weekly summary for a web dashboard.
-        Be celebratory and encouraging. Keep under 60 words."""
-
         user_prompt = f"""Create a brief weekly summary:
         
         - Habit completions this week: {stats['weekly_completions']}
@@ -291,7 +555,16 @@ def get_weekly_summary() -> str:
         
         Celebrate progress and encourage continued effort."""
 
-        return call_ai_api(user_prompt, system_prompt)
+        year, week, _ = datetime.now().isocalendar()
+        key = (
+            "weekly",
+            stats["weekly_completions"],
+            stats["weekly_tasks"],
+            stats["active_streaks"],
+            year,
+            week,
+        )
+        return _cached_ai_call(key, user_prompt, _SYSTEM_WEEKLY)
 
     except Exception as e:
         return "📊 This week you've made progress on your journey. Every step counts - keep it up! 🌟"
@@ -304,11 +577,8 @@ def get_smart_notification(notification_type: str = "daily") -> str:
             return get_daily_greeting()
         elif notification_type == "evening":
             # Evening reflection
-            system_prompt = f"""You are {AI_ASSISTANT_NAME}, providing an evening reflection message.
-            Be reflective and prepare them for tomorrow. Keep under 40 words."""
-
             user_prompt = "Create an encouraging evening message that reflects on today and motivates for tomorrow."
-            return call_ai_api(user_prompt, system_prompt)
+            return call_ai_api(user_prompt, _SYSTEM_EVENING)
         else:
             return get_motivational_message("general")
 
@@ -328,20 +598,32 @@ def check_ai_service() -> dict:
             "features_available": False,
         }
 
+    if (
+        _HEALTH_CACHE["result"]
+        and time.monotonic() - _HEALTH_CACHE["at"] < _HEALTH_CACHE_TTL
+    ):
+        return _HEALTH_CACHE["result"]
+
     try:
-        # Test with a simple prompt
-        test_response = call_ai_api("Say 'AI service is working'")
-        if "working" in test_response.lower():
-            return {
+        # Key-checking metadata endpoints validate credentials without spending tokens
+        if OPENROUTER_API_KEY:
+            response = _OPENROUTER_SESSION.get(f"{OPENROUTER_BASE_URL}/key", timeout=3)
+        else:
+            response = _ANTHROPIC_SESSION.get(f"{ANTHROPIC_BASE_URL}/models", timeout=3)
+
+        if response.status_code == 200:
+            result = {
                 "status": "online",
                 "message": "AI service is ready",
                 "features_available": True,
                 "model": DEFAULT_AI_MODEL,
             }
+            _HEALTH_CACHE.update(at=time.monotonic(), result=result)
+            return result
         else:
             return {
                 "status": "error",
-                "message": "Unexpected AI response",
+                "message": _friendly_error(response.status_code),
                 "features_available": False,
             }
     except Exception as e:
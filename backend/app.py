@@ -7,11 +7,12 @@ Refactored to use the application factory in backend/app/__init__.py
 This preserves the original "python backend/app.py" workflow while enabling
 blueprint-based modularization and cleaner architecture.
 """
-import os
+import config
 from app import create_app
 
-app = create_app(os.getenv("FLASK_ENV"))
+# create_app() resolves FLASK_ENV from the settings (environment, then .env)
+app = create_app()
 
 if __name__ == "__main__":
-    debug_mode = os.getenv("FLASK_ENV") == "development"
+    debug_mode = config.SETTINGS.FLASK_ENV == "development"
     app.run(host="0.0.0.0", port=5000, debug=debug_mode)
@@ -2,21 +2,38 @@
 """
 App factory for Habit Tracker (HabitNow-inspired structure)
 Sets up Flask app, configuration, CORS, DB initialization, error handling,
-and registers API blueprints (if present).
+and registers API blueprints.
 
 This refactor is backward compatible with the existing backend/app.py entrypoint.
 """
-import os
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
 
 from flask import Flask, jsonify, render_template
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; Flask's stdlib provider is used otherwise
+    orjson = None
+
+try:
+    from flask_compress import Compress
+except ImportError:  # Optional; responses are sent uncompressed otherwise
+    Compress = None
+
 # Reuse existing modules to keep functionality
 from config import get_config
-from database import init_db
+from database import close_db, init_db
+from app.blueprints import (
+    ai as ai_bp,
+    habits as habits_bp,
+    migrate as migrate_bp,
+    stats as stats_bp,
+    tasks as tasks_bp,
+)
 
 
 def _resolve_paths():
@@ -28,6 +45,20 @@ def _resolve_paths():
     return str(templates_dir), str(static_dir)
 
 
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that serializes responses with orjson"""
+
+    def dumps(self, obj, **kwargs) -> str:
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        # Types orjson doesn't know (Decimal, __html__, ...) use Flask's encoder
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 def create_app(config_name: Optional[str] = None) -> Flask:
     templates_dir, static_dir = _resolve_paths()
 
@@ -37,24 +68,31 @@ def create_app(config_name: Optional[str] = None) -> Flask:
         static_folder=static_dir,
     )
 
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
+
     # Load configuration
     ConfigClass = get_config(config_name)
     app.config.from_object(ConfigClass)
 
+    # Gzip/brotli JSON and static responses when Flask-Compress is installed
+    if Compress is not None:
+        Compress(app)
+
     # CORS
     cors_origins = getattr(ConfigClass, "CORS_ORIGINS", ["*"])
     CORS(app, resources={r"/api/*": {"origins": cors_origins}})
 
     # Initialize database (uses existing sqlite schema)
     init_db()
+    # Roll back whatever a request leaves uncommitted on its thread's connection
+    app.teardown_appcontext(close_db)
 
-    # Expose AI availability in config for blueprints
-    try:
-        # Lazy check mirrors existing optional AI import pattern
-        import ai_service  # noqa: F401
-        app.config["AI_ENABLED"] = True
-    except Exception:
-        app.config["AI_ENABLED"] = False
+    # Expose AI availability without importing ai_service; the AI blueprint
+    # loads it on first use
+    app.config["AI_ENABLED"] = bool(
+        app.config.get("OPENROUTER_API_KEY") or app.config.get("ANTHROPIC_API_KEY")
+    )
 
     # ---------- Error Handling ----------
     @app.errorhandler(Exception)
@@ -75,31 +113,18 @@ def create_app(config_name: Optional[str] = None) -> Flask:
             "timestamp": datetime.now().isoformat(),
         })
 
-    # ---------- Blueprint registration (safe; only if files exist) ----------
-    # Blueprints are optional in this step; they will be added in subsequent iterations.
-    def _register_optional_blueprint(import_path: str, bp_name: str):
-        try:
-            module = __import__(import_path, fromlist=["bp"])  # expects module to expose `bp`
-            bp = getattr(module, "bp", None)
-            if bp is not None:
-                app.register_blueprint(bp)
-                app.logger.info(f"Registered blueprint: {bp_name}")
-        except Exception as ex:
-            # Skip silently to preserve backward compatibility until files are added
-            app.logger.debug(f"Blueprint {bp_name} not registered: {ex}")
-
-    # Register available blueprints
-    _register_optional_blueprint("app.blueprints.habits", "habits")
-    _register_optional_blueprint("app.blueprints.tasks", "tasks")
-    _register_optional_blueprint("app.blueprints.stats", "stats")
-    _register_optional_blueprint("app.blueprints.ai", "ai")
-    _register_optional_blueprint("app.blueprints.migrate", "migrate")
+    # ---------- Blueprint registration ----------
+    for module in (habits_bp, tasks_bp, stats_bp, ai_bp, migrate_bp):
+        app.register_blueprint(module.bp)
 
     return app
 
 
 if __name__ == "__main__":
     # Local run for quick verification
-    app = create_app(os.getenv("FLASK_ENV"))
-    debug_mode = os.getenv("FLASK_ENV") == "development"
+    import config
+
+    app = create_app()
+    # Read from the settings so a FLASK_ENV set only in .env is honoured
+    debug_mode = config.SETTINGS.FLASK_ENV == "development"
     app.run(host="0.0.0.0", port=5000, debug=debug_mode)
@@ -1,24 +1,23 @@
-from flask import Blueprint, request, jsonify, current_app
+import json
+from functools import lru_cache
+
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 
 bp = Blueprint("ai", __name__, url_prefix="/api/ai")
 
-# Optional AI functionality
-try:
-    from ai_service import (
-        get_daily_greeting,
-        get_habit_insights,
-        get_task_prioritization,
-        suggest_new_habit,
-        get_motivational_message,
-        get_weekly_summary,
-    )
-    AI_AVAILABLE = True
-except Exception:
-    AI_AVAILABLE = False
+
+@lru_cache(maxsize=1)
+def _ai():
+    """Import ai_service on first use; None when it can't be loaded"""
+    try:
+        import ai_service
+    except Exception:
+        return None
+    return ai_service
 
 
 def _guard_ai():
-    if not AI_AVAILABLE:
+    if _ai() is None:
         return jsonify({"error": "AI features not available"}), 503
     return None
 
@@ -28,7 +27,22 @@ def ai_greeting():
     guard = _guard_ai()
     if guard:
         return guard
-    return jsonify({"message": get_daily_greeting()})
+    return jsonify({"message": _ai().get_daily_greeting()})
+
+
+@bp.get("/greeting/stream")
+def ai_greeting_stream():
+    guard = _guard_ai()
+    if guard:
+        return guard
+
+    def generate():
+        # Server-sent events: one JSON-encoded text delta per frame
+        for chunk in _ai().stream_daily_greeting():
+            yield f"data: {json.dumps({'delta': chunk})}\n\n"
+        yield "event: done\ndata: {}\n\n"
+
+    return Response(stream_with_context(generate()), mimetype="text/event-stream")
 
 
 @bp.get("/insights")
@@ -36,7 +50,7 @@ def ai_insights():
     guard = _guard_ai()
     if guard:
         return guard
-    return jsonify({"message": get_habit_insights()})
+    return jsonify({"message": _ai().get_habit_insights()})
 
 
 @bp.get("/prioritize")
@@ -44,7 +58,7 @@ def ai_prioritize():
     guard = _guard_ai()
     if guard:
         return guard
-    return jsonify({"message": get_task_prioritization()})
+    return jsonify({"message": _ai().get_task_prioritization()})
 
 
 @bp.get("/suggest")
@@ -52,7 +66,7 @@ def ai_suggest():
     guard = _guard_ai()
     if guard:
         return guard
-    return jsonify({"message": suggest_new_habit()})
+    return jsonify({"message": _ai().suggest_new_habit()})
 
 
 @bp.post("/motivate")
@@ -62,7 +76,7 @@ def ai_motivate():
         return guard
     data = request.get_json(silent=True) or {}
     context = data.get("context", "general")
-    return jsonify({"message": get_motivational_message(context)})
+    return jsonify({"message": _ai().get_motivational_message(context)})
 
 
 @bp.get("/weekly")
@@ -70,4 +84,12 @@ def ai_weekly_summary():
     guard = _guard_ai()
     if guard:
         return guard
-    return jsonify({"message": get_weekly_summary()})
+    return jsonify({"message": _ai().get_weekly_summary()})
+
+
+@bp.get("/dashboard")
+def ai_dashboard():
+    guard = _guard_ai()
+    if guard:
+        return guard
+    return jsonify(_ai().get_dashboard_bundle())
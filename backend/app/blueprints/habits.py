@@ -1,29 +1,29 @@
 from flask import Blueprint, request, jsonify
 from services import HabitService
 from database import get_db_connection
-
-# Optional AI dependency handled at call sites
-try:
-    from ai_service import get_motivational_message
-    AI_ENABLED = True
-except Exception:
-    AI_ENABLED = False
-    def get_motivational_message(*args, **kwargs):
-        return ""
+from app.blueprints.ai import _ai
+from app.caching import conditional_json
 
 bp = Blueprint("habits", __name__, url_prefix="/api/habits")
 
 
+def _motivation(context: str) -> str:
+    """Motivational message for `context`, or "" when AI is unavailable"""
+    # Shares the AI blueprint's loader, which imports ai_service once on first use
+    ai_service = _ai()
+    if ai_service is None:
+        return ""
+    return ai_service.get_motivational_message(context)
+
+
 @bp.get("/archived")
 def list_archived():
-    habits = HabitService.get_archived_habits()
-    return jsonify(habits)
+    return conditional_json("habits:archived", HabitService.get_archived_habits)
 
 
 @bp.get("")
 def list_habits():
-    habits = HabitService.get_all_habits_with_status()
-    return jsonify(habits)
+    return conditional_json("habits", HabitService.get_all_habits_with_status)
 
 
 @bp.post("")
@@ -39,15 +39,8 @@ def create_habit():
     if error:
         return jsonify({"error": error}), 400
 
-    motivation = ""
-    if AI_ENABLED:
-        try:
-            motivation = get_motivational_message("new_habit")
-        except Exception:
-            pass
-
     response_data = dict(new_habit)
-    response_data["motivation"] = motivation
+    response_data["motivation"] = _motivation("new_habit")
     return jsonify(response_data)
 
 
@@ -67,15 +60,8 @@ def complete_habit(habit_id: int):
         status_code = 404 if "not found" in error.lower() else 400
         return jsonify({"error": error}), status_code
 
-    motivation = ""
-    if AI_ENABLED:
-        try:
-            motivation = get_motivational_message("habit_completed")
-        except Exception:
-            pass
-
     response_data = dict(result)
-    response_data["motivation"] = motivation
+    response_data["motivation"] = _motivation("habit_completed")
     return jsonify(response_data)
 
 
@@ -112,10 +98,11 @@ def delete_habit(habit_id: int):
     """Delete a habit and its completion history"""
     conn = get_db_connection()
     try:
-        # Remove dependent completions first
-        conn.execute("DELETE FROM habit_completions WHERE habit_id = ?", (habit_id,))
-        cursor = conn.execute("DELETE FROM habits WHERE id = ?", (habit_id,))
-        if cursor.rowcount == 0:
+        # Completions are removed by the ON DELETE CASCADE foreign key
+        deleted = conn.execute(
+            "DELETE FROM habits WHERE id = ? RETURNING id", (habit_id,)
+        ).fetchall()
+        if not deleted:
             conn.rollback()
             return jsonify({"error": "Habit not found"}), 404
         conn.commit()
@@ -123,5 +110,3 @@ def delete_habit(habit_id: int):
     except Exception:
         conn.rollback()
         return jsonify({"error": "Failed to delete habit"}), 500
-    finally:
-        conn.close()
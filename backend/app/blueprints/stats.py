@@ -1,10 +1,16 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint
 from services import TaskService
+from app.caching import conditional_json
 
 bp = Blueprint("stats", __name__, url_prefix="/api")
 
 
 @bp.get("/stats")
 def get_stats():
-    stats = TaskService.get_dashboard_stats()
-    return jsonify(stats)
+    return conditional_json("stats", TaskService.get_dashboard_stats)
+
+
+@bp.get("/today")
+def get_today():
+    """Habits, archived habits, today's tasks and stats in one response"""
+    return conditional_json("today", TaskService.get_today_snapshot)
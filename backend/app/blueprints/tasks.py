@@ -57,5 +57,3 @@ def delete_task(task_id: int):
     except Exception:
         conn.rollback()
         return jsonify({"error": "Failed to delete task"}), 500
-    finally:
-        conn.close()
@@ -0,0 +1,33 @@
+"""
+Conditional GET support for read-only API endpoints.
+
+ETags are derived from the database's data_version counter (bumped by triggers
+on every write) plus today's date, so unchanged dashboards are answered with a
+304 before any rows are read or serialized.
+"""
+import hashlib
+from datetime import datetime
+
+from flask import current_app, jsonify, request
+
+from services import StatsService
+
+
+def data_etag(scope: str) -> str:
+    """ETag for `scope` that changes with any row change or at midnight"""
+    today = datetime.now().strftime("%Y-%m-%d")
+    token = f"{scope}:{StatsService.get_data_version()}:{today}"
+    return hashlib.blake2b(token.encode(), digest_size=8).hexdigest()
+
+
+def conditional_json(scope: str, build):
+    """Reply 304 when the client's ETag is current, otherwise jsonify(build())"""
+    etag = data_etag(scope)
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = jsonify(build())
+    response.set_etag(etag)
+    # Let browsers keep the body but revalidate on every poll
+    response.cache_control.no_cache = True
+    return response
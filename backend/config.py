@@ -6,76 +6,217 @@ Handles environment variables, API settings, and app configuration
 """
 
 import os
+from collections import ChainMap
+from dataclasses import dataclass
 from datetime import timedelta
-from dotenv import load_dotenv
+from functools import cached_property, lru_cache
+
+def _flag(value):
+    """Parse a "true"/"false" environment string"""
+    return value.lower() == "true"
+
+
+def _csv(value):
+    """Parse a comma-separated environment string"""
+    return value.split(",")
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Typed settings, parsed from the environment once"""
+
+    SECRET_KEY: str
+    FLASK_ENV: str
+    DEBUG: bool
+    DATABASE_FILE: str
+    DATABASE_URL: str
+    OPENROUTER_API_KEY: str
+    OPENROUTER_BASE_URL: str
+    ANTHROPIC_API_KEY: str
+    DEFAULT_AI_MODEL: str
+    AI_REQUEST_TIMEOUT: int
+    AI_MAX_TOKENS: int
+    AI_TEMPERATURE: float
+    AI_ASSISTANT_NAME: str
+    AI_PERSONALITY: str
+    APP_NAME: str
+    APP_VERSION: str
+    CORS_ORIGINS: list
+    NOTIFICATIONS_ENABLED: bool
+    RATE_LIMIT_ENABLED: bool
+    RATE_LIMIT_DEFAULT: str
+    TIMEZONE: str
+    AUTO_BACKUP: bool
+    BACKUP_RETENTION_DAYS: int
+    LOG_LEVEL: str
+    LOG_FILE: str
+
+
+# Setting name -> (default, parser for the raw environment string)
+_SPEC = {
+    "SECRET_KEY": ("dev-secret-key-change-in-production", str),
+    "FLASK_ENV": ("development", str),
+    "DEBUG": (False, _flag),
+    "DATABASE_FILE": ("habit_tracker.db", str),
+    "DATABASE_URL": (None, str),  # Derived from DATABASE_FILE when unset
+    "OPENROUTER_API_KEY": ("", str),
+    "OPENROUTER_BASE_URL": ("https://openrouter.ai/api/v1", str),
+    "ANTHROPIC_API_KEY": ("", str),
+    "DEFAULT_AI_MODEL": ("anthropic/claude-3.5-sonnet", str),
+    "AI_REQUEST_TIMEOUT": (30, int),
+    "AI_MAX_TOKENS": (300, int),
+    "AI_TEMPERATURE": (0.7, float),
+    "AI_ASSISTANT_NAME": ("HabBot", str),
+    "AI_PERSONALITY": ("encouraging, motivational, and insightful", str),
+    "APP_NAME": ("AI Habit Tracker", str),
+    "APP_VERSION": ("1.0.0", str),
+    "CORS_ORIGINS": (["*"], _csv),
+    "NOTIFICATIONS_ENABLED": (True, _flag),
+    "RATE_LIMIT_ENABLED": (False, _flag),
+    "RATE_LIMIT_DEFAULT": ("100 per hour", str),
+    "TIMEZONE": ("UTC", str),
+    "AUTO_BACKUP": (False, _flag),
+    "BACKUP_RETENTION_DAYS": (30, int),
+    "LOG_LEVEL": ("INFO", str),
+    "LOG_FILE": ("habit_tracker.log", str),
+}
+
+
+# Relative DATABASE_FILE settings live alongside this module, whatever the CWD
+_BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _read_dotenv():
+    """Values from the nearest .env file, skipping bare keys without a value"""
+    from dotenv import dotenv_values, find_dotenv
+
+    return {k: v for k, v in dotenv_values(find_dotenv()).items() if v is not None}
+
+
+# Settings resolve through layered lookups instead of merging .env into
+# os.environ: a snapshot of the environment, then .env. Both are read on the
+# first get_config() call rather than at import
+_ENV_SNAPSHOT = {}
+_LAYERS = ChainMap(_ENV_SNAPSHOT, {})
+
+
+def _build_settings():
+    """Parse every setting once; unparseable values fall back to the default"""
+    values = {}
+    for name, (default, cast) in _SPEC.items():
+        values[name] = default
+        if name in _LAYERS:
+            try:
+                values[name] = cast(_LAYERS[name])
+            except ValueError:
+                print(
+                    f"⚠️  Invalid value for {name}: {_LAYERS[name]!r}, using {default!r}"
+                )
+    if values["DATABASE_URL"] is None:
+        values["DATABASE_URL"] = f"sqlite:///{values['DATABASE_FILE']}"
+    return Settings(**values)
+
 
-# Load environment variables from .env file
-load_dotenv()
+SETTINGS = None
+
+
+def _ensure_env():
+    """Load the environment and .env into SETTINGS and Config, once"""
+    global SETTINGS
+    if SETTINGS is not None:
+        return
+    _ENV_SNAPSHOT.clear()
+    _ENV_SNAPSHOT.update(os.environ)
+    _LAYERS.maps[1] = _read_dotenv()
+    SETTINGS = _build_settings()
+    for name in _SPEC:
+        setattr(Config, name, getattr(SETTINGS, name))
 
 
 class Config:
-    """Base configuration class"""
+    """Base configuration class
+
+    Annotated settings are filled in from SETTINGS by the first get_config() call.
+    """
 
     # Flask Configuration
-    SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
-    FLASK_ENV = os.getenv("FLASK_ENV", "development")
-    DEBUG = os.getenv("DEBUG", "False").lower() == "true"
+    SECRET_KEY: str
+    FLASK_ENV: str
+    DEBUG: bool
 
     # Database Configuration
-    DATABASE_FILE = os.getenv("DATABASE_FILE", "habit_tracker.db")
-    DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{DATABASE_FILE}")
+    DATABASE_FILE: str
+    DATABASE_URL: str
 
     # AI Service Configuration
-    OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")
-    OPENROUTER_BASE_URL = os.getenv(
-        "OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1"
-    )
-    ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
-    DEFAULT_AI_MODEL = os.getenv("DEFAULT_AI_MODEL", "anthropic/claude-3.5-sonnet")
-    AI_REQUEST_TIMEOUT = int(os.getenv("AI_REQUEST_TIMEOUT", "30"))
-    AI_MAX_TOKENS = int(os.getenv("AI_MAX_TOKENS", "300"))
-    AI_TEMPERATURE = float(os.getenv("AI_TEMPERATURE", "0.7"))
+    OPENROUTER_API_KEY: str
+    OPENROUTER_BASE_URL: str
+    ANTHROPIC_API_KEY: str
+    DEFAULT_AI_MODEL: str
+    AI_REQUEST_TIMEOUT: int
+    AI_MAX_TOKENS: int
+    AI_TEMPERATURE: float
 
     # AI Assistant Settings
-    AI_ASSISTANT_NAME = os.getenv("AI_ASSISTANT_NAME", "HabBot")
-    AI_PERSONALITY = os.getenv(
-        "AI_PERSONALITY", "encouraging, motivational, and insightful"
-    )
+    AI_ASSISTANT_NAME: str
+    AI_PERSONALITY: str
 
     # Application Settings
-    APP_NAME = os.getenv("APP_NAME", "AI Habit Tracker")
-    APP_VERSION = os.getenv("APP_VERSION", "1.0.0")
+    APP_NAME: str
+    APP_VERSION: str
+
+    # Response Compression (Flask-Compress)
+    COMPRESS_ALGORITHM = ["br", "gzip"]
+    COMPRESS_MIN_SIZE = 500
+    # SSE endpoints must flush each frame; don't buffer streams into one body
+    COMPRESS_STREAMS = False
 
     # CORS Settings
-    CORS_ORIGINS = os.getenv("CORS_ORIGINS", "*").split(",")
+    CORS_ORIGINS: list
 
     # Notification Settings
-    NOTIFICATIONS_ENABLED = os.getenv("NOTIFICATIONS_ENABLED", "True").lower() == "true"
+    NOTIFICATIONS_ENABLED: bool
 
     # Rate Limiting (for future implementation)
-    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "False").lower() == "true"
-    RATE_LIMIT_DEFAULT = os.getenv("RATE_LIMIT_DEFAULT", "100 per hour")
+    RATE_LIMIT_ENABLED: bool
+    RATE_LIMIT_DEFAULT: str
 
     # Timezone Settings
-    TIMEZONE = os.getenv("TIMEZONE", "UTC")
+    TIMEZONE: str
 
     # Backup Settings
-    AUTO_BACKUP = os.getenv("AUTO_BACKUP", "False").lower() == "true"
-    BACKUP_RETENTION_DAYS = int(os.getenv("BACKUP_RETENTION_DAYS", "30"))
+    AUTO_BACKUP: bool
+    BACKUP_RETENTION_DAYS: int
 
     # Logging Configuration
-    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-    LOG_FILE = os.getenv("LOG_FILE", "habit_tracker.log")
-
-    @property
+    LOG_LEVEL: str
+    LOG_FILE: str
+
+    @classmethod
+    def clear_env_cache(cls):
+        """Re-read os.environ and .env and rebuild SETTINGS and Config from them"""
+        global SETTINGS
+        SETTINGS = None
+        _ensure_env()
+        # FLASK_ENV may have changed, so forget the resolved config classes
+        get_config.cache_clear()
+        # ...and the database path resolved from them (imported here because
+        # database imports this module)
+        from database import refresh_database_file
+
+        refresh_database_file()
+
+    @cached_property
     def ai_enabled(self):
         """Check if AI features are available"""
         return bool(self.OPENROUTER_API_KEY or self.ANTHROPIC_API_KEY)
 
-    @property
+    @cached_property
     def database_path(self):
-        """Get absolute database path"""
-        return os.path.abspath(self.DATABASE_FILE)
+        """Absolute database path (relative to backend/), or ":memory:" as is"""
+        if self.DATABASE_FILE == ":memory:":
+            return self.DATABASE_FILE
+        return os.path.abspath(os.path.join(_BACKEND_DIR, self.DATABASE_FILE))
 
     def validate_config(self):
         """Validate critical configuration settings"""
@@ -93,14 +234,23 @@ class Config:
             issues.append("🚨 SECRET_KEY must be changed in production!")
 
         # Check database path
+        if self._db_dir_issue:
+            issues.append(self._db_dir_issue)
+
+        return issues
+
+    @cached_property
+    def _db_dir_issue(self):
+        """Create the database directory if missing; checked once per instance"""
+        if self.database_path == ":memory:":
+            return None
         db_dir = os.path.dirname(self.database_path)
         if not os.path.exists(db_dir):
             try:
                 os.makedirs(db_dir, exist_ok=True)
             except Exception as e:
-                issues.append(f"❌ Cannot create database directory: {e}")
-
-        return issues
+                return f"❌ Cannot create database directory: {e}"
+        return None
 
 
 class DevelopmentConfig(Config):
@@ -143,28 +293,34 @@ config_map = {
 }
 
 
+@lru_cache(maxsize=8)
 def get_config(config_name=None):
     """Get configuration class based on environment"""
+    _ensure_env()
     if config_name is None:
-        config_name = os.getenv("FLASK_ENV", "development")
+        config_name = SETTINGS.FLASK_ENV
 
     return config_map.get(config_name, config_map["default"])
 
 
+_STATUS_TEMPLATE = """
+🔧 Configuration Status:
+   Environment: {config.FLASK_ENV}
+   Debug Mode: {config.DEBUG}
+   AI Enabled: {config.ai_enabled}
+   Database: {config.DATABASE_FILE}
+   AI Model: {config.DEFAULT_AI_MODEL}
+   Assistant: {config.AI_ASSISTANT_NAME}"""
+
+
 def print_config_status():
     """Print configuration status for debugging"""
-    config = get_config()
+    config = get_config()()
 
-    print(f"\n🔧 Configuration Status:")
-    print(f"   Environment: {config.FLASK_ENV}")
-    print(f"   Debug Mode: {config.DEBUG}")
-    print(f"   AI Enabled: {config().ai_enabled}")
-    print(f"   Database: {config.DATABASE_FILE}")
-    print(f"   AI Model: {config.DEFAULT_AI_MODEL}")
-    print(f"   Assistant: {config.AI_ASSISTANT_NAME}")
+    print(_STATUS_TEMPLATE.format(config=config))
 
     # Check for issues
-    issues = config().validate_config()
+    issues = config.validate_config()
     if issues:
         print(f"\n⚠️  Configuration Issues:")
         for issue in issues:
@@ -5,122 +5,392 @@ Database setup and connection management for Habit Tracker
 SQLite database with proper schema for habits, tasks, and completions
 """
 
+import atexit
 import sqlite3
 import os
-from datetime import datetime
+import threading
+import weakref
+from datetime import date, datetime
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+
+from config import get_config
+
+# ":memory:" databases are private to one connection, so the in-memory test
+# database is a named shared-cache one kept alive by _memory_keepalive
+_MEMORY_URI = "file:habit_tracker?mode=memory&cache=shared"
+_memory_keepalive = None
+
+
+@lru_cache(maxsize=1)
+def database_file():
+    """Database location from the active config: ":memory:" or an absolute path"""
+    # Same resolver validate_config() checks, so both agree on the directory
+    return get_config()().database_path
+
+# Each thread keeps one open connection for its lifetime instead of reconnecting
+# (and re-running PRAGMAs) on every call. _generation is bumped whenever the
+# database file is replaced so threads reopen instead of using the old file.
+_TLS = threading.local()
+_OPEN_CONNECTIONS = weakref.WeakSet()
+_CONNECTIONS_LOCK = threading.Lock()
+_generation = 0
+
+
+# Stored in PRAGMA user_version once init_db has brought a file up to date;
+# bump it whenever the schema, migrations, indexes or triggers below change
+SCHEMA_VERSION = 5
+
+# Idempotent schema, parsed in one executescript() pass by init_db
+_SCHEMA_DDL = """
+CREATE TABLE IF NOT EXISTS habits (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    streak INTEGER DEFAULT 0,
+    last_done DATE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    done BOOLEAN DEFAULT FALSE,
+    date DATE NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Habit completions tracking table
+CREATE TABLE IF NOT EXISTS habit_completions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    habit_id INTEGER NOT NULL,
+    date DATE NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (habit_id) REFERENCES habits (id) ON DELETE CASCADE,
+    UNIQUE(habit_id, date)
+);
+
+-- Single-row counter bumped on every write; read endpoints derive ETags from it
+CREATE TABLE IF NOT EXISTS data_version (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0);
+"""
 
-# Store the database file alongside this module to avoid duplicate DBs created
-# from varying working directories
-DATABASE_FILE = os.path.join(os.path.dirname(__file__), "habit_tracker.db")
+# Columns added to existing tables later: (table, column, ALTER statement)
+_COLUMN_MIGRATIONS = (
+    ("habits", "reminder_time", "ALTER TABLE habits ADD COLUMN reminder_time TEXT;"),
+    (
+        "habits",
+        "is_archived",
+        "ALTER TABLE habits ADD COLUMN is_archived BOOLEAN DEFAULT 0;",
+    ),
+    ("tasks", "reminder_time", "ALTER TABLE tasks ADD COLUMN reminder_time TEXT;"),
+)
+
+_INDEXES_DDL = """
+CREATE INDEX IF NOT EXISTS idx_habits_name ON habits(name);
+CREATE INDEX IF NOT EXISTS idx_habits_created_at ON habits(created_at DESC);
+-- Best streak is a single B-tree probe and active streaks a range scan
+CREATE INDEX IF NOT EXISTS idx_habits_streak ON habits(streak);
+-- Covers the per-day task list, including its ORDER BY and done counts
+DROP INDEX IF EXISTS idx_tasks_date;
+CREATE INDEX IF NOT EXISTS idx_tasks_date_created
+    ON tasks(date, created_at DESC, done, name);
+CREATE INDEX IF NOT EXISTS idx_habit_completions_habit_date
+    ON habit_completions(habit_id, date);
+CREATE INDEX IF NOT EXISTS idx_habit_completions_date ON habit_completions(date);
+""" + "".join(
+    f"""
+CREATE TRIGGER IF NOT EXISTS bump_version_{table}_{event.lower()}
+AFTER {event} ON {table}
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE id = 1;
+END;
+"""
+    for table in ("habits", "tasks", "habit_completions")
+    for event in ("INSERT", "UPDATE", "DELETE")
+)
+
+# Lets create_habit reject case-insensitive duplicates with a single INSERT
+_HABIT_NAME_INDEX_DDL = """
+CREATE UNIQUE INDEX IF NOT EXISTS idx_habits_name_nocase
+    ON habits(name COLLATE NOCASE);
+"""
 
 
-def get_db_connection():
-    """Get database connection with row factory"""
-    conn = sqlite3.connect(DATABASE_FILE)
+# Prepared statements kept per connection (sqlite3 defaults to 128); the
+# thread's connection lives for the whole process, so every query stays hot
+_CACHED_STATEMENTS = 256
+
+
+class _SharedConnection(sqlite3.Connection):
+    """Connection cached for the current thread; callers' close() keeps it open"""
+
+    def close(self):
+        # Discard uncommitted work as a real close would, but keep the handle
+        if self.in_transaction:
+            self.rollback()
+
+
+def _connect(factory=sqlite3.Connection):
+    global _memory_keepalive
+    if database_file() == ":memory:":
+        conn = sqlite3.connect(
+            _MEMORY_URI,
+            uri=True,
+            factory=factory,
+            check_same_thread=False,
+            cached_statements=_CACHED_STATEMENTS,
+        )
+        with _CONNECTIONS_LOCK:
+            if _memory_keepalive is None:
+                _memory_keepalive = sqlite3.connect(
+                    _MEMORY_URI, uri=True, check_same_thread=False
+                )
+    else:
+        conn = sqlite3.connect(
+            database_file(),
+            factory=factory,
+            check_same_thread=False,
+            cached_statements=_CACHED_STATEMENTS,
+        )
     conn.row_factory = sqlite3.Row  # Enable dict-like access to rows
+    conn.execute("PRAGMA foreign_keys = ON")  # Needed for ON DELETE CASCADE
+    # WAL lets readers run alongside a writer; the mode persists in the file
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")  # Safe with WAL, far fewer fsyncs
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -64000")  # 64 MB page cache
+    # Wait out another worker's write lock instead of raising SQLITE_BUSY
+    conn.execute("PRAGMA busy_timeout = 5000")
+    # Serve page reads from a memory map rather than read() syscalls
+    conn.execute("PRAGMA mmap_size = 268435456")
     return conn
 
 
-def init_db():
-    """Initialize database with required tables"""
-    conn = get_db_connection()
+def get_db_connection():
+    """Get database connection with row factory
+
+    Returns the calling thread's cached connection, opening it on first use.
+    """
+    conn = getattr(_TLS, "conn", None)
+    if conn is None or _TLS.generation != _generation:
+        conn = _connect(_SharedConnection)
+        _TLS.conn, _TLS.generation = conn, _generation
+        with _CONNECTIONS_LOCK:
+            _OPEN_CONNECTIONS.add(conn)
+    return conn
 
-    try:
-        # Create habits table
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS habits (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL UNIQUE,
-                streak INTEGER DEFAULT 0,
-                last_done DATE,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """
-        )
 
-        # Add new columns for reminders to habits table
-        try:
-            conn.execute("ALTER TABLE habits ADD COLUMN reminder_time TEXT;")
-        except sqlite3.OperationalError as e:
-            print(f"Skipping habit reminder column creation: {e}")
+class _ConnPool:
+    """Hands out the calling thread's cached connection for the life of a block"""
 
-        # Add archive flag to habits table
+    @contextmanager
+    def borrow(self):
+        """Yield the thread's connection, rolling back anything left uncommitted"""
+        conn = get_db_connection()
+        # A nested borrow leaves the enclosing block's transaction alone
+        outer = conn.in_transaction
         try:
-            conn.execute("ALTER TABLE habits ADD COLUMN is_archived BOOLEAN DEFAULT 0;")
-        except sqlite3.OperationalError as e:
-            print(f"Skipping habit is_archived column creation: {e}")
+            yield conn
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        if conn.in_transaction and not outer:
+            conn.rollback()
 
-        # Create tasks table
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                done BOOLEAN DEFAULT FALSE,
-                date DATE NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """
-        )
 
-        # Add new columns for reminders to tasks table
-        try:
-            conn.execute("ALTER TABLE tasks ADD COLUMN reminder_time TEXT;")
-        except sqlite3.OperationalError as e:
-            print(f"Skipping task reminder column creation: {e}")
+connection_pool = _ConnPool()
 
-        # Create habit completions tracking table
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS habit_completions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                habit_id INTEGER NOT NULL,
-                date DATE NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (habit_id) REFERENCES habits (id),
-                UNIQUE(habit_id, date)
-            )
-        """
-        )
 
-        # Create indexes for better performance
-        conn.execute(
-            """
-            CREATE INDEX IF NOT EXISTS idx_habits_name ON habits(name)
-        """
-        )
+@contextmanager
+def write_transaction(conn):
+    """Run a batch of writes in one explicit BEGIN IMMEDIATE ... COMMIT
 
-        conn.execute(
-            """
-            CREATE INDEX IF NOT EXISTS idx_tasks_date ON tasks(date)
-        """
-        )
+    Taking the write lock up front avoids a mid-batch SQLITE_BUSY when another
+    connection starts writing, and the batch costs a single journal flush.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
 
-        conn.execute(
-            """
-            CREATE INDEX IF NOT EXISTS idx_habit_completions_habit_date 
-            ON habit_completions(habit_id, date)
+
+def _close_all_connections():
+    """Really close every cached connection (at exit or when the file is replaced)"""
+    global _memory_keepalive
+    with _CONNECTIONS_LOCK:
+        connections = list(_OPEN_CONNECTIONS)
+        _OPEN_CONNECTIONS.clear()
+        if _memory_keepalive is not None:
+            # Last reference to the in-memory database; it is discarded
+            connections.append(_memory_keepalive)
+            _memory_keepalive = None
+    for conn in connections:
+        sqlite3.Connection.close(conn)
+
+
+def _invalidate_connections():
+    """Make every thread reopen its connection on next use"""
+    global _generation
+    _generation += 1
+    _close_all_connections()
+
+
+atexit.register(_close_all_connections)
+
+
+def refresh_database_file():
+    """Re-resolve database_file() after a config change, reopening if it moved"""
+    previous = database_file()
+    database_file.cache_clear()
+    if database_file() != previous:
+        _invalidate_connections()
+
+
+def close_db(exception=None):
+    """Roll back anything a request left uncommitted (registered as an app teardown)
+
+    The thread's connection itself stays open for the next request.
+    """
+    conn = getattr(_TLS, "conn", None)
+    if conn is not None and _TLS.generation == _generation and conn.in_transaction:
+        conn.rollback()
+
+
+def _migrate_completions_cascade(conn):
+    """Rebuild habit_completions created before its foreign key cascaded deletes"""
+    foreign_keys = conn.execute("PRAGMA foreign_key_list(habit_completions)").fetchall()
+    if not foreign_keys or foreign_keys[0]["on_delete"] == "CASCADE":
+        return
+
+    # SQLite cannot alter a foreign key in place, so copy into a new table
+    conn.executescript(
         """
-        )
+        BEGIN;
+        CREATE TABLE habit_completions_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            habit_id INTEGER NOT NULL,
+            date DATE NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (habit_id) REFERENCES habits (id) ON DELETE CASCADE,
+            UNIQUE(habit_id, date)
+        );
+        INSERT INTO habit_completions_new (id, habit_id, date, created_at)
+            SELECT id, habit_id, date, created_at FROM habit_completions
+            WHERE habit_id IN (SELECT id FROM habits);
+        DROP TABLE habit_completions;
+        ALTER TABLE habit_completions_new RENAME TO habit_completions;
+        COMMIT;
+    """
+    )
+    print("Migrated habit_completions to cascade habit deletes")
+
+
+def _column_migrations(conn):
+    """ALTER statements for columns added after a table was first created"""
+    columns = {
+        table: {r[1] for r in conn.execute(f"PRAGMA table_info({table})")}
+        for table in ("habits", "tasks")
+    }
+    return [
+        ddl for table, column, ddl in _COLUMN_MIGRATIONS if column not in columns[table]
+    ]
+
+
+def _habit_name_index(conn):
+    """Case-insensitive name index DDL, or "" if existing names would violate it"""
+    try:
+        clash = conn.execute(
+            "SELECT name FROM habits GROUP BY name COLLATE NOCASE "
+            "HAVING COUNT(*) > 1 LIMIT 1"
+        ).fetchone()
+    except sqlite3.OperationalError:  # Fresh file, habits not created yet
+        clash = None
+    if clash:
+        print(f"Skipping unique habit name index, duplicate name: {clash[0]}")
+        return ""
+    return _HABIT_NAME_INDEX_DDL
+
 
-        conn.commit()
+def init_db():
+    """Initialize database with required tables"""
+    conn = get_db_connection()
+
+    try:
+        # Warm start: the file already has the current schema
+        if conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+            return
+
+        # Rebuild first so the indexes and triggers below land on the new table
+        _migrate_completions_cascade(conn)
+
+        name_index = _habit_name_index(conn)
+        conn.executescript(
+            "BEGIN IMMEDIATE;\n"
+            + _SCHEMA_DDL
+            + "\n".join(_column_migrations(conn))
+            + _INDEXES_DDL
+            + name_index
+            # Give the planner statistics for the indexes just created
+            + "ANALYZE;\n"
+            # Without the name index the file is not up to date; retry next start
+            + (f"PRAGMA user_version = {SCHEMA_VERSION};\n" if name_index else "")
+            + "COMMIT;"
+        )
         print("Database initialized successfully")
 
     except Exception as e:
         print(f"Database initialization error: {e}")
         conn.rollback()
 
-    finally:
-        conn.close()
 
+def reset_db(hard=False):
+    """Reset database (for development/testing)
 
-def reset_db():
-    """Reset database (for development/testing)"""
-    if os.path.exists(DATABASE_FILE):
-        os.remove(DATABASE_FILE)
-        print("Database reset")
+    Drops every table on the current connection and recreates the schema.
+    With hard=True the database file (and its WAL sidecars) is deleted instead.
+    The data version keeps counting up so cached reads and ETags never match
+    a version from before the reset.
+    """
+    try:
+        version = get_db_connection().execute(
+            "SELECT version FROM data_version WHERE id = 1"
+        ).fetchone()[0]
+    except (sqlite3.Error, TypeError):
+        version = 0
+
+    if hard:
+        _invalidate_connections()
+        if database_file() != ":memory:":
+            db_path = Path(database_file())
+            db_path.unlink(missing_ok=True)
+            # Drop WAL sidecar files so they are not replayed into the fresh database
+            for suffix in ("-wal", "-shm"):
+                db_path.with_name(db_path.name + suffix).unlink(missing_ok=True)
+    else:
+        conn = get_db_connection()
+        conn.executescript(
+            """
+            BEGIN IMMEDIATE;
+            DROP TABLE IF EXISTS habit_completions;
+            DROP TABLE IF EXISTS tasks;
+            DROP TABLE IF EXISTS habits;
+            DROP TABLE IF EXISTS data_version;
+            PRAGMA user_version = 0;
+            COMMIT;
+        """
+        )
+    print("Database reset")
     init_db()
+    with write_transaction(get_db_connection()) as conn:
+        conn.execute("UPDATE data_version SET version = ? WHERE id = 1", (version + 1,))
 
 
 def get_database_stats():
@@ -128,33 +398,23 @@ def get_database_stats():
     conn = get_db_connection()
 
     try:
-        stats = {}
-
-        # Count records
-        stats["habits_count"] = conn.execute("SELECT COUNT(*) FROM habits").fetchone()[
-            0
-        ]
-        stats["tasks_count"] = conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
-        stats["completions_count"] = conn.execute(
-            "SELECT COUNT(*) FROM habit_completions"
-        ).fetchone()[0]
-
-        # Get date ranges
-        first_habit = conn.execute("SELECT MIN(created_at) FROM habits").fetchone()[0]
-        first_task = conn.execute("SELECT MIN(created_at) FROM tasks").fetchone()[0]
-
-        stats["first_habit_date"] = first_habit
-        stats["first_task_date"] = first_task
+        # Counts and date ranges in a single statement
+        row = conn.execute(
+            """
+            SELECT (SELECT COUNT(*) FROM habits) AS habits_count,
+                   (SELECT COUNT(*) FROM tasks) AS tasks_count,
+                   (SELECT COUNT(*) FROM habit_completions) AS completions_count,
+                   (SELECT MIN(created_at) FROM habits) AS first_habit_date,
+                   (SELECT MIN(created_at) FROM tasks) AS first_task_date
+        """
+        ).fetchone()
 
-        return stats
+        return dict(row)
 
     except Exception as e:
         print(f"❌ Error getting database stats: {e}")
         return {}
 
-    finally:
-        conn.close()
-
 
 def backup_database(backup_path=None):
     """Create database backup"""
@@ -163,9 +423,15 @@ def backup_database(backup_path=None):
         backup_path = f"habit_tracker_backup_{timestamp}.db"
 
     try:
-        import shutil
-
-        shutil.copy2(DATABASE_FILE, backup_path)
+        # SQLite's online backup copies a consistent snapshot even while other
+        # connections are writing, including pages still in the WAL
+        src = get_db_connection()
+        dst = sqlite3.connect(backup_path)
+        try:
+            with dst:
+                src.backup(dst, pages=1024)
+        finally:
+            dst.close()
         print(f"Database backed up to {backup_path}")
         return backup_path
     except Exception as e:
@@ -176,10 +442,14 @@ def backup_database(backup_path=None):
 def restore_database(backup_path):
     """Restore database from backup"""
     try:
-        import shutil
-
         if os.path.exists(backup_path):
-            shutil.copy2(backup_path, DATABASE_FILE)
+            # Copy pages into the live database so in-memory databases and
+            # other threads' open connections see the restored data
+            src = sqlite3.connect(backup_path)
+            try:
+                src.backup(get_db_connection())
+            finally:
+                src.close()
             print(f"Database restored from {backup_path}")
             return True
         else:
@@ -190,88 +460,122 @@ def restore_database(backup_path):
         return False
 
 
+def _import_name(value):
+    """Stripped habit/task name from a JSON import; ValueError if it is blank"""
+    name = value.strip()
+    if not name:
+        raise ValueError("name is blank")
+    return name
+
+
+def _habit_import_row(entry, created_at):
+    """(name, streak, last_done, created_at) with every column coerced"""
+    last_done = entry.get("last_done") or None
+    if last_done:
+        last_done = date.fromisoformat(last_done).isoformat()
+    return (
+        _import_name(entry["name"]),
+        int(entry.get("streak") or 0),
+        last_done,
+        created_at,
+    )
+
+
+def _task_import_row(entry, today, created_at):
+    """(name, done, date, created_at) with every column coerced"""
+    return (
+        _import_name(entry["name"]),
+        1 if entry.get("done", False) else 0,
+        date.fromisoformat(entry.get("date") or today).isoformat(),
+        created_at,
+    )
+
+
+def _import_rows(kind, entries, build, *args):
+    """Rows built from JSON entries; malformed ones are skipped with a warning
+
+    Coercing every column up front means one bad value cannot fail a whole
+    executemany batch.
+    """
+    rows = []
+    add_row = rows.append
+    for entry in entries:
+        try:
+            add_row(build(entry, *args))
+        except Exception as e:
+            name = entry.get("name", "unknown") if isinstance(entry, dict) else entry
+            print(f"Warning: Error migrating {kind} '{name}': {e}")
+    return rows
+
+
+def import_habit_rows(entries, created_at):
+    """INSERT-ready habit rows from a JSON export's "habits" list"""
+    return _import_rows("habit", entries, _habit_import_row, created_at)
+
+
+def import_task_rows(entries, today, created_at):
+    """INSERT-ready task rows from a JSON export's "tasks" list"""
+    return _import_rows("task", entries, _task_import_row, today, created_at)
+
+
 def migrate_from_json(json_file_path="data.json"):
     """Migrate data from CLI version's JSON file"""
-    import json
-
     if not os.path.exists(json_file_path):
         print(f"JSON file not found: {json_file_path}")
         return False
 
     try:
-        with open(json_file_path, "r") as f:
-            data = json.load(f)
-
-        conn = get_db_connection()
-        migrated_habits = 0
-        migrated_tasks = 0
+        try:
+            import orjson  # C parser; much faster on large exports
 
-        # Migrate habits
-        for habit_data in data.get("habits", []):
-            try:
-                conn.execute(
-                    """
-                    INSERT OR IGNORE INTO habits (name, streak, last_done, created_at)
-                    VALUES (?, ?, ?, ?)
-                """,
-                    (
-                        habit_data["name"],
-                        habit_data.get("streak", 0),
-                        habit_data.get("last_done"),
-                        datetime.now().isoformat(),
-                    ),
-                )
+            data = orjson.loads(Path(json_file_path).read_bytes())
+        except ImportError:
+            import json
 
-                # If habit has completions, create completion records
-                if habit_data.get("last_done"):
-                    habit_id = conn.execute(
-                        "SELECT id FROM habits WHERE name = ?", (habit_data["name"],)
-                    ).fetchone()
-
-                    if habit_id:
-                        conn.execute(
-                            """
-                            INSERT OR IGNORE INTO habit_completions (habit_id, date, created_at)
-                            VALUES (?, ?, ?)
-                        """,
-                            (
-                                habit_id[0],
-                                habit_data["last_done"],
-                                datetime.now().isoformat(),
-                            ),
-                        )
-
-                migrated_habits += 1
-
-            except Exception as e:
-                print(
-                    f"Warning: Error migrating habit '{habit_data.get('name', 'unknown')}': {e}"
-                )
+            with open(json_file_path, "r") as f:
+                data = json.load(f)
 
-        # Migrate tasks
-        for task_data in data.get("tasks", []):
-            try:
-                conn.execute(
-                    """
-                    INSERT OR IGNORE INTO tasks (name, done, date, created_at)
-                    VALUES (?, ?, ?, ?)
-                """,
-                    (
-                        task_data["name"],
-                        1 if task_data.get("done", False) else 0,
-                        task_data.get("date", datetime.now().strftime("%Y-%m-%d")),
-                        datetime.now().isoformat(),
-                    ),
-                )
-                migrated_tasks += 1
+        # Read the clock once for the whole import
+        started = datetime.now()
+        now = started.isoformat()
+        today = started.strftime("%Y-%m-%d")
 
-            except Exception as e:
-                print(
-                    f"Warning: Error migrating task '{task_data.get('name', 'unknown')}': {e}"
-                )
+        habit_rows = import_habit_rows(data.get("habits", []), now)
+        task_rows = import_task_rows(data.get("tasks", []), today, now)
 
-        conn.commit()
-        conn.close()
+        conn = get_db_connection()
+        # One transaction for the whole import
+        with write_transaction(conn):
+            conn.executemany(
+                """
+                INSERT OR IGNORE INTO habits (name, streak, last_done, created_at)
+                VALUES (?, ?, ?, ?)
+            """,
+                habit_rows,
+            )
+            # Resolve each habit id inside the insert through the unique name
+            # index, so no statement binds one variable per imported habit
+            conn.executemany(
+                """
+                INSERT OR IGNORE INTO habit_completions (habit_id, date, created_at)
+                SELECT id, ?, ? FROM habits WHERE name = ?
+            """,
+                # Habits that were done get a completion record for that day
+                [
+                    (last_done, now, name)
+                    for name, _, last_done, _ in habit_rows
+                    if last_done
+                ],
+            )
+            conn.executemany(
+                """
+                INSERT OR IGNORE INTO tasks (name, done, date, created_at)
+                VALUES (?, ?, ?, ?)
+            """,
+                task_rows,
+            )
+        migrated_habits = len(habit_rows)
+        migrated_tasks = len(task_rows)
 
         print(f"Migration completed:")
         print(f"   📊 Habits migrated: {migrated_habits}")
@@ -298,14 +602,6 @@ def create_sample_data():
             ("Meditate", 3, today),
         ]
 
-        for name, streak, last_done in sample_habits:
-            conn.execute(
-                """
-                INSERT OR IGNORE INTO habits (name, streak, last_done)
-                VALUES (?, ?, ?)
-            """,
-                (name, streak, last_done),
-            )
 
         # Sample tasks for today
         sample_tasks = [
@@ -316,24 +612,26 @@ def create_sample_data():
             ("Update resume", False),
         ]
 
-        for name, done in sample_tasks:
-            conn.execute(
+        # One prepared statement per table, committed together
+        with write_transaction(conn):
+            conn.executemany(
+                """
+                INSERT OR IGNORE INTO habits (name, streak, last_done)
+                VALUES (?, ?, ?)
+            """,
+                sample_habits,
+            )
+            conn.executemany(
                 """
                 INSERT OR IGNORE INTO tasks (name, done, date)
                 VALUES (?, ?, ?)
             """,
-                (name, done, today),
+                [(name, int(done), today) for name, done in sample_tasks],
             )
-
-        conn.commit()
         print("Sample data created")
 
     except Exception as e:
         print(f"Error creating sample data: {e}")
-        conn.rollback()
-
-    finally:
-        conn.close()
 
 
 if __name__ == "__main__":
@@ -354,4 +652,4 @@ if __name__ == "__main__":
     print(f"   Tasks: {stats.get('tasks_count', 0)}")
     print(f"   Completions: {stats.get('completions_count', 0)}")
 
-    print(f"\nDatabase ready at: {DATABASE_FILE}")
+    print(f"\nDatabase ready at: {database_file()}")
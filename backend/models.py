@@ -5,13 +5,43 @@ Data models and business logic for AI-Powered Habit Tracker
 Handles Habit and Task operations with database abstraction
 """
 
+import csv
+import io
 import sqlite3
-from datetime import datetime, timedelta
+from datetime import date as _date, datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 import json
 
-from database import get_db_connection
+try:
+    import orjson
+except ImportError:  # Optional speedup; exports fall back to the stdlib encoder
+    orjson = None
+
+from database import connection_pool, write_transaction
+
+# Explicit column lists in dataclass field order, so from_db_row can unpack
+# rows positionally; init_db migrates reminder_time onto older files
+_HABIT_COLUMNS = "id, name, streak, last_done, created_at, reminder_time"
+_TASK_COLUMNS = "id, name, done, date, created_at, reminder_time"
+_COMPLETION_COLUMNS = "id, habit_id, date, created_at"
+
+# Hot read queries, formatted once at import rather than on every call
+_SQL_ALL_HABITS = f"SELECT {_HABIT_COLUMNS} FROM habits ORDER BY created_at DESC"
+_SQL_HABIT_BY_ID = f"SELECT {_HABIT_COLUMNS} FROM habits WHERE id = ?"
+_SQL_TASKS_FOR_DATE = (
+    f"SELECT {_TASK_COLUMNS} FROM tasks WHERE date = ? ORDER BY created_at DESC"
+)
+_SQL_TASK_BY_ID = f"SELECT {_TASK_COLUMNS} FROM tasks WHERE id = ?"
+_SQL_COMPLETIONS_SINCE = (
+    f"SELECT {_COMPLETION_COLUMNS} FROM habit_completions "
+    "WHERE date >= ? ORDER BY date DESC"
+)
+
+
+def _today() -> str:
+    """Today's date as YYYY-MM-DD"""
+    return _date.today().isoformat()
 
 
 @dataclass
@@ -25,7 +55,7 @@ class Habit:
     created_at: Optional[str] = None
     reminder_time: Optional[str] = None  # HH:MM format
 
-    def to_dict(self) -> Dict:
+    def to_dict(self, today: Optional[str] = None) -> Dict:
         """Convert to dictionary for JSON serialization"""
         return {
             "id": self.id,
@@ -33,25 +63,22 @@ class Habit:
             "streak": self.streak,
             "last_done": self.last_done,
             "created_at": self.created_at,
-            "done_today": self.is_done_today(),
+            "done_today": self.is_done_today(today),
         }
 
-    def is_done_today(self) -> bool:
+    def is_done_today(self, today: Optional[str] = None) -> bool:
         """Check if habit is completed today"""
         if not self.last_done:
             return False
 
-        today = datetime.now().strftime("%Y-%m-%d")
-        return self.last_done == today
+        return self.last_done == (today or _today())
 
     def days_since_last_done(self) -> int:
         """Calculate days since last completion"""
         if not self.last_done:
             return float("inf")
 
-        last_done_date = datetime.strptime(self.last_done, "%Y-%m-%d")
-        today = datetime.now()
-        return (today.date() - last_done_date.date()).days
+        return (_date.today() - _date.fromisoformat(self.last_done)).days
 
     def is_streak_active(self) -> bool:
         """Check if streak is currently active (done today or yesterday)"""
@@ -60,21 +87,8 @@ class Habit:
 
     @classmethod
     def from_db_row(cls, row):
-        """Create Habit instance from database row"""
-        reminder = None
-        try:
-            reminder = row["reminder_time"]
-        except Exception:
-            reminder = None
-
-        return cls(
-            id=row["id"],
-            name=row["name"],
-            streak=row["streak"],
-            last_done=row["last_done"],
-            created_at=row["created_at"],
-            reminder_time=reminder,
-        )
+        """Create Habit instance from a row selected with _HABIT_COLUMNS"""
+        return cls(*row)
 
 
 @dataclass
@@ -98,36 +112,22 @@ class Task:
             "created_at": self.created_at,
         }
 
-    def is_today(self) -> bool:
+    def is_today(self, today: Optional[str] = None) -> bool:
         """Check if task is for today"""
-        today = datetime.now().strftime("%Y-%m-%d")
-        return self.date == today
+        return self.date == (today or _today())
 
     def is_overdue(self) -> bool:
         """Check if task is overdue"""
         if self.done:
             return False
 
-        task_date = datetime.strptime(self.date, "%Y-%m-%d")
-        return task_date.date() < datetime.now().date()
+        return _date.fromisoformat(self.date) < _date.today()
 
     @classmethod
     def from_db_row(cls, row):
-        """Create Task instance from database row"""
-        reminder = None
-        try:
-            reminder = row["reminder_time"]
-        except Exception:
-            reminder = None
-
-        return cls(
-            id=row["id"],
-            name=row["name"],
-            done=bool(row["done"]),
-            date=row["date"],
-            created_at=row["created_at"],
-            reminder_time=reminder,
-        )
+        """Create Task instance from a row selected with _TASK_COLUMNS"""
+        id_, name, done, date, created_at, reminder_time = row
+        return cls(id_, name, bool(done), date, created_at, reminder_time)
 
 
 @dataclass
@@ -141,13 +141,33 @@ class HabitCompletion:
 
     @classmethod
     def from_db_row(cls, row):
-        """Create HabitCompletion instance from database row"""
-        return cls(
-            id=row["id"],
-            habit_id=row["habit_id"],
-            date=row["date"],
-            created_at=row["created_at"],
-        )
+        """Create HabitCompletion from a row selected with _COMPLETION_COLUMNS"""
+        return cls(*row)
+
+
+def _habit_dicts(conn, today: str) -> List[Dict]:
+    """All habits in Habit.to_dict() shape, with done_today joined in by SQL"""
+    rows = conn.execute(
+        """
+        SELECT h.id, h.name, h.streak, h.last_done, h.created_at,
+               hc.habit_id IS NOT NULL AS done_today
+        FROM habits h
+        LEFT JOIN habit_completions hc ON hc.habit_id = h.id AND hc.date = ?
+        ORDER BY h.created_at DESC
+    """,
+        (today,),
+    )
+    return [
+        {
+            "id": id_,
+            "name": name,
+            "streak": streak,
+            "last_done": last_done,
+            "created_at": created_at,
+            "done_today": bool(done_today),
+        }
+        for id_, name, streak, last_done, created_at, done_today in rows
+    ]
 
 
 class HabitManager:
@@ -156,33 +176,18 @@ class HabitManager:
     @staticmethod
     def get_all_habits() -> List[Habit]:
         """Get all habits with today's completion status"""
-        conn = get_db_connection()
-        try:
-            rows = conn.execute(
-                """
-                SELECT * FROM habits ORDER BY created_at DESC
-            """
-            ).fetchall()
+        with connection_pool.borrow() as conn:
+            rows = conn.execute(_SQL_ALL_HABITS).fetchall()
 
             return [Habit.from_db_row(row) for row in rows]
-        finally:
-            conn.close()
 
     @staticmethod
     def get_habit_by_id(habit_id: int) -> Optional[Habit]:
         """Get habit by ID"""
-        conn = get_db_connection()
-        try:
-            row = conn.execute(
-                """
-                SELECT * FROM habits WHERE id = ?
-            """,
-                (habit_id,),
-            ).fetchone()
+        with connection_pool.borrow() as conn:
+            row = conn.execute(_SQL_HABIT_BY_ID, (habit_id,)).fetchone()
 
             return Habit.from_db_row(row) if row else None
-        finally:
-            conn.close()
 
     @staticmethod
     def create_habit(name: str) -> Tuple[bool, str, Optional[Habit]]:
@@ -191,240 +196,155 @@ class HabitManager:
         if not name:
             return False, "Habit name is required", None
 
-        conn = get_db_connection()
-        try:
-            # Check if habit already exists
-            existing = conn.execute(
-                """
-                SELECT id FROM habits WHERE LOWER(name) = LOWER(?)
-            """,
-                (name,),
-            ).fetchone()
-
-            if existing:
-                return False, "Habit already exists", None
-
-            # Create new habit
-            cursor = conn.execute(
-                """
-                INSERT INTO habits (name, streak, last_done, created_at)
-                VALUES (?, 0, NULL, ?)
-            """,
-                (name, datetime.now().isoformat()),
-            )
-
-            habit_id = cursor.lastrowid
-            conn.commit()
-
-            # Return the created habit
-            habit = Habit(
-                id=habit_id,
-                name=name,
-                streak=0,
-                last_done=None,
-                created_at=datetime.now().isoformat(),
-            )
+        created_at = datetime.now().isoformat()
+        with connection_pool.borrow() as conn:
+            try:
+                with conn:
+                    # Case-insensitive duplicates insert nothing and return no
+                    # row, even on a file where the NOCASE index was skipped
+                    row = conn.execute(
+                        """
+                        INSERT OR IGNORE INTO habits (name, streak, last_done, created_at)
+                        SELECT ?1, 0, NULL, ?2
+                        WHERE NOT EXISTS (
+                            SELECT 1 FROM habits WHERE name = ?1 COLLATE NOCASE
+                        )
+                        RETURNING id
+                    """,
+                        (name, created_at),
+                    ).fetchone()
+
+                if row is None:
+                    return False, "Habit already exists", None
+
+                habit_id = row[0]
+
+                # Return the created habit
+                habit = Habit(
+                    id=habit_id,
+                    name=name,
+                    streak=0,
+                    last_done=None,
+                    created_at=created_at,
+                )
 
-            return True, "Habit created successfully", habit
+                return True, "Habit created successfully", habit
 
-        except Exception as e:
-            conn.rollback()
-            return False, str(e), None
-        finally:
-            conn.close()
+            except sqlite3.Error as e:
+                return False, str(e), None
 
     @staticmethod
     def complete_habit(habit_id: int) -> Tuple[bool, str, Optional[Dict]]:
         """Mark habit as completed for today"""
-        conn = get_db_connection()
-        today = datetime.now().strftime("%Y-%m-%d")
-
-        try:
-            # Get habit
-            habit_row = conn.execute(
-                """
-                SELECT * FROM habits WHERE id = ?
-            """,
-                (habit_id,),
-            ).fetchone()
-
-            if not habit_row:
-                return False, "Habit not found", None
-
-            habit = Habit.from_db_row(habit_row)
-
-            # Check if already completed today
-            existing = conn.execute(
-                """
-                SELECT id FROM habit_completions WHERE habit_id = ? AND date = ?
-            """,
-                (habit_id, today),
-            ).fetchone()
-
-            if existing:
-                return False, "Habit already completed today", None
-
-            # Calculate new streak
-            new_streak = HabitManager._calculate_new_streak(habit, today)
-
-            # Record completion
-            conn.execute(
-                """
-                INSERT INTO habit_completions (habit_id, date, created_at)
-                VALUES (?, ?, ?)
-            """,
-                (habit_id, today, datetime.now().isoformat()),
-            )
-
-            # Update habit
-            conn.execute(
-                """
-                UPDATE habits SET streak = ?, last_done = ? WHERE id = ?
-            """,
-                (new_streak, today, habit_id),
-            )
-
-            conn.commit()
-
-            return (
-                True,
-                "Habit completed!",
-                {"new_streak": new_streak, "completion_date": today},
-            )
-
-        except Exception as e:
-            conn.rollback()
-            return False, str(e), None
-        finally:
-            conn.close()
+        now = datetime.now()
+        today = now.date().isoformat()
+
+        with connection_pool.borrow() as conn:
+            try:
+                with write_transaction(conn):
+                    # Record completion; no row comes back if the habit is
+                    # missing or was already completed today
+                    inserted = conn.execute(
+                        """
+                        INSERT INTO habit_completions (habit_id, date, created_at)
+                        SELECT id, ?, ? FROM habits WHERE id = ?
+                        ON CONFLICT (habit_id, date) DO NOTHING
+                        RETURNING habit_id
+                    """,
+                        (today, now.isoformat(), habit_id),
+                    ).fetchone()
+
+                    if not inserted:
+                        exists = conn.execute(
+                            "SELECT 1 FROM habits WHERE id = ?", (habit_id,)
+                        ).fetchone()
+                        if not exists:
+                            return False, "Habit not found", None
+                        return False, "Habit already completed today", None
+
+                    # Consecutive day continues the streak, a gap starts over
+                    new_streak = conn.execute(
+                        """
+                        UPDATE habits
+                        SET streak = CASE WHEN last_done = date(?, '-1 day')
+                                          THEN streak + 1 ELSE 1 END,
+                            last_done = ?
+                        WHERE id = ?
+                        RETURNING streak
+                    """,
+                        (today, today, habit_id),
+                    ).fetchone()[0]
+
+                return (
+                    True,
+                    "Habit completed!",
+                    {"new_streak": new_streak, "completion_date": today},
+                )
 
-    @staticmethod
-    def _calculate_new_streak(habit: Habit, completion_date: str) -> int:
-        """Calculate new streak based on last completion"""
-        if not habit.last_done:
-            return 1
-
-        last_done = datetime.strptime(habit.last_done, "%Y-%m-%d")
-        completion = datetime.strptime(completion_date, "%Y-%m-%d")
-        days_diff = (completion.date() - last_done.date()).days
-
-        if days_diff == 1:
-            # Consecutive day - continue streak
-            return habit.streak + 1
-        else:
-            # Gap in streak - start over
-            return 1
+            except sqlite3.Error as e:
+                return False, str(e), None
 
     @staticmethod
     def delete_habit(habit_id: int) -> Tuple[bool, str]:
         """Delete a habit and all its completions"""
-        conn = get_db_connection()
-        try:
-            # Check if habit exists
-            habit = conn.execute(
-                """
-                SELECT id FROM habits WHERE id = ?
-            """,
-                (habit_id,),
-            ).fetchone()
+        with connection_pool.borrow() as conn:
+            try:
+                with conn:
+                    # Completions go with it via ON DELETE CASCADE
+                    deleted = conn.execute(
+                        """
+                        DELETE FROM habits WHERE id = ? RETURNING id
+                    """,
+                        (habit_id,),
+                    ).fetchone()
 
-            if not habit:
-                return False, "Habit not found"
-
-            # Delete completions first (foreign key constraint)
-            conn.execute(
-                """
-                DELETE FROM habit_completions WHERE habit_id = ?
-            """,
-                (habit_id,),
-            )
-
-            # Delete habit
-            conn.execute(
-                """
-                DELETE FROM habits WHERE id = ?
-            """,
-                (habit_id,),
-            )
+                if not deleted:
+                    return False, "Habit not found"
 
-            conn.commit()
-            return True, "Habit deleted successfully"
+                return True, "Habit deleted successfully"
 
-        except Exception as e:
-            conn.rollback()
-            return False, str(e)
-        finally:
-            conn.close()
+            except sqlite3.Error as e:
+                return False, str(e)
 
     @staticmethod
     def get_habit_statistics() -> Dict:
         """Get comprehensive habit statistics"""
-        conn = get_db_connection()
-        try:
-            today = datetime.now().strftime("%Y-%m-%d")
+        today = _today()
 
-            stats = {
-                "total_habits": 0,
-                "habits_done_today": 0,
-                "completion_rate_today": 0,
-                "total_active_streaks": 0,
-                "longest_streak": 0,
-                "habits_by_streak": {
-                    "excellent": 0,  # 7+ days
-                    "good": 0,  # 3-6 days
-                    "starting": 0,  # 1-2 days
-                    "inactive": 0,  # 0 days
-                },
-            }
-
-            # Basic counts
-            stats["total_habits"] = conn.execute(
-                """
-                SELECT COUNT(*) FROM habits
-            """
-            ).fetchone()[0]
-
-            stats["habits_done_today"] = conn.execute(
+        with connection_pool.borrow() as conn:
+            # Counts and streak buckets aggregated by SQLite in one pass
+            row = conn.execute(
                 """
-                SELECT COUNT(*) FROM habit_completions WHERE date = ?
+                SELECT COUNT(*) AS total,
+                       COALESCE(SUM(streak >= 7), 0) AS excellent,
+                       COALESCE(SUM(streak BETWEEN 3 AND 6), 0) AS good,
+                       COALESCE(SUM(streak BETWEEN 1 AND 2), 0) AS starting,
+                       COALESCE(SUM(streak <= 0), 0) AS inactive,
+                       COALESCE(SUM(streak > 0), 0) AS active,
+                       COALESCE(MAX(streak), 0) AS longest,
+                       (SELECT COUNT(*) FROM habit_completions WHERE date = ?)
+                           AS done_today
+                FROM habits
             """,
                 (today,),
-            ).fetchone()[0]
-
-            # Completion rate
-            if stats["total_habits"] > 0:
-                stats["completion_rate_today"] = round(
-                    (stats["habits_done_today"] / stats["total_habits"]) * 100, 1
-                )
-
-            # Streak statistics
-            streak_data = conn.execute(
-                """
-                SELECT streak FROM habits
-            """
-            ).fetchall()
-
-            for row in streak_data:
-                streak = row[0]
-                if streak >= 7:
-                    stats["habits_by_streak"]["excellent"] += 1
-                elif streak >= 3:
-                    stats["habits_by_streak"]["good"] += 1
-                elif streak >= 1:
-                    stats["habits_by_streak"]["starting"] += 1
-                else:
-                    stats["habits_by_streak"]["inactive"] += 1
-
-                if streak > 0:
-                    stats["total_active_streaks"] += 1
-
-                if streak > stats["longest_streak"]:
-                    stats["longest_streak"] = streak
-
-            return stats
+            ).fetchone()
 
-        finally:
-            conn.close()
+        total = row["total"]
+        return {
+            "total_habits": total,
+            "habits_done_today": row["done_today"],
+            "completion_rate_today": (
+                round((row["done_today"] / total) * 100, 1) if total > 0 else 0
+            ),
+            "total_active_streaks": row["active"],
+            "longest_streak": row["longest"],
+            "habits_by_streak": {
+                "excellent": row["excellent"],  # 7+ days
+                "good": row["good"],  # 3-6 days
+                "starting": row["starting"],  # 1-2 days
+                "inactive": row["inactive"],  # 0 days
+            },
+        }
 
 
 class TaskManager:
@@ -434,36 +354,20 @@ class TaskManager:
     def get_tasks_for_date(date: str = None) -> List[Task]:
         """Get tasks for specific date (defaults to today)"""
         if not date:
-            date = datetime.now().strftime("%Y-%m-%d")
+            date = _today()
 
-        conn = get_db_connection()
-        try:
-            rows = conn.execute(
-                """
-                SELECT * FROM tasks WHERE date = ? ORDER BY created_at DESC
-            """,
-                (date,),
-            ).fetchall()
+        with connection_pool.borrow() as conn:
+            rows = conn.execute(_SQL_TASKS_FOR_DATE, (date,)).fetchall()
 
             return [Task.from_db_row(row) for row in rows]
-        finally:
-            conn.close()
 
     @staticmethod
     def get_task_by_id(task_id: int) -> Optional[Task]:
         """Get task by ID"""
-        conn = get_db_connection()
-        try:
-            row = conn.execute(
-                """
-                SELECT * FROM tasks WHERE id = ?
-            """,
-                (task_id,),
-            ).fetchone()
+        with connection_pool.borrow() as conn:
+            row = conn.execute(_SQL_TASK_BY_ID, (task_id,)).fetchone()
 
             return Task.from_db_row(row) if row else None
-        finally:
-            conn.close()
 
     @staticmethod
     def create_task(name: str, date: str = None) -> Tuple[bool, str, Optional[Task]]:
@@ -473,107 +377,88 @@ class TaskManager:
             return False, "Task name is required", None
 
         if not date:
-            date = datetime.now().strftime("%Y-%m-%d")
-
-        conn = get_db_connection()
-        try:
-            cursor = conn.execute(
-                """
-                INSERT INTO tasks (name, done, date, created_at)
-                VALUES (?, 0, ?, ?)
-            """,
-                (name, date, datetime.now().isoformat()),
-            )
-
-            task_id = cursor.lastrowid
-            conn.commit()
-
-            task = Task(
-                id=task_id,
-                name=name,
-                done=False,
-                date=date,
-                created_at=datetime.now().isoformat(),
-            )
+            date = _today()
+
+        created_at = datetime.now().isoformat()
+        with connection_pool.borrow() as conn:
+            try:
+                with conn:
+                    cursor = conn.execute(
+                        """
+                        INSERT INTO tasks (name, done, date, created_at)
+                        VALUES (?, 0, ?, ?)
+                    """,
+                        (name, date, created_at),
+                    )
+
+                task_id = cursor.lastrowid
+
+                task = Task(
+                    id=task_id,
+                    name=name,
+                    done=False,
+                    date=date,
+                    created_at=created_at,
+                )
 
-            return True, "Task created successfully", task
+                return True, "Task created successfully", task
 
-        except Exception as e:
-            conn.rollback()
-            return False, str(e), None
-        finally:
-            conn.close()
+            except sqlite3.Error as e:
+                return False, str(e), None
 
     @staticmethod
     def toggle_task_completion(task_id: int) -> Tuple[bool, str, Optional[bool]]:
         """Toggle task completion status"""
-        conn = get_db_connection()
-        try:
-            # Get current status
-            row = conn.execute(
-                """
-                SELECT done FROM tasks WHERE id = ?
-            """,
-                (task_id,),
-            ).fetchone()
+        with connection_pool.borrow() as conn:
+            try:
+                with conn:
+                    # Flip in place; no row comes back if the task doesn't exist
+                    row = conn.execute(
+                        """
+                        UPDATE tasks SET done = NOT done WHERE id = ? RETURNING done
+                    """,
+                        (task_id,),
+                    ).fetchone()
 
-            if not row:
-                return False, "Task not found", None
+                if not row:
+                    return False, "Task not found", None
 
-            current_status = bool(row[0])
-            new_status = not current_status
+                new_status = bool(row[0])
 
-            # Update status
-            conn.execute(
-                """
-                UPDATE tasks SET done = ? WHERE id = ?
-            """,
-                (new_status, task_id),
-            )
-
-            conn.commit()
+                status_text = "completed" if new_status else "marked as pending"
+                return True, f"Task {status_text}", new_status
 
-            status_text = "completed" if new_status else "marked as pending"
-            return True, f"Task {status_text}", new_status
-
-        except Exception as e:
-            conn.rollback()
-            return False, str(e), None
-        finally:
-            conn.close()
+            except sqlite3.Error as e:
+                return False, str(e), None
 
     @staticmethod
     def delete_task(task_id: int) -> Tuple[bool, str]:
         """Delete a task"""
-        conn = get_db_connection()
-        try:
-            cursor = conn.execute(
-                """
-                DELETE FROM tasks WHERE id = ?
-            """,
-                (task_id,),
-            )
+        with connection_pool.borrow() as conn:
+            try:
+                with conn:
+                    cursor = conn.execute(
+                        """
+                        DELETE FROM tasks WHERE id = ?
+                    """,
+                        (task_id,),
+                    )
 
-            if cursor.rowcount == 0:
-                return False, "Task not found"
+                if cursor.rowcount == 0:
+                    return False, "Task not found"
 
-            conn.commit()
-            return True, "Task deleted successfully"
+                return True, "Task deleted successfully"
 
-        except Exception as e:
-            conn.rollback()
-            return False, str(e)
-        finally:
-            conn.close()
+            except sqlite3.Error as e:
+                return False, str(e)
 
     @staticmethod
     def get_task_statistics(date: str = None) -> Dict:
         """Get task statistics for specific date"""
         if not date:
-            date = datetime.now().strftime("%Y-%m-%d")
+            date = _today()
 
-        conn = get_db_connection()
-        try:
+        with connection_pool.borrow() as conn:
             stats = {
                 "date": date,
                 "total_tasks": 0,
@@ -582,20 +467,15 @@ class TaskManager:
                 "completion_rate": 0,
             }
 
-            # Get counts
-            stats["total_tasks"] = conn.execute(
+            # Both counts from one pass over the date's index entries
+            total, completed = conn.execute(
                 """
-                SELECT COUNT(*) FROM tasks WHERE date = ?
+                SELECT COUNT(*), COALESCE(SUM(done), 0) FROM tasks WHERE date = ?
             """,
                 (date,),
-            ).fetchone()[0]
-
-            stats["completed_tasks"] = conn.execute(
-                """
-                SELECT COUNT(*) FROM tasks WHERE date = ? AND done = 1
-            """,
-                (date,),
-            ).fetchone()[0]
+            ).fetchone()
+            stats["total_tasks"] = total
+            stats["completed_tasks"] = completed
 
             stats["pending_tasks"] = stats["total_tasks"] - stats["completed_tasks"]
 
@@ -607,9 +487,6 @@ class TaskManager:
 
             return stats
 
-        finally:
-            conn.close()
-
 
 class DataExporter:
     """Export data to various formats"""
@@ -617,61 +494,75 @@ class DataExporter:
     @staticmethod
     def export_to_json(include_completions: bool = True) -> str:
         """Export all data to JSON format"""
-        data = {
-            "export_date": datetime.now().isoformat(),
-            "habits": [],
-            "tasks": [],
-        }
-
-        # Export habits
-        habits = HabitManager.get_all_habits()
-        data["habits"] = [habit.to_dict() for habit in habits]
+        now = datetime.now()
+        today = now.date().isoformat()
+        start_date = (now - timedelta(days=30)).strftime("%Y-%m-%d")
+        data = {"export_date": now.isoformat()}
 
-        # Export tasks (last 30 days)
-        start_date = datetime.now() - timedelta(days=30)
-        conn = get_db_connection()
+        # All three reads share one borrowed connection
+        with connection_pool.borrow() as conn:
+            # Export habits
+            data["habits"] = _habit_dicts(conn, today)
 
-        try:
+            # Export tasks (last 30 days), shaped like Task.to_dict()
             rows = conn.execute(
                 """
-                SELECT * FROM tasks WHERE date >= ? ORDER BY date DESC, created_at DESC
+                SELECT id, name, done, date, created_at FROM tasks
+                WHERE date >= ? ORDER BY date DESC, created_at DESC
             """,
-                (start_date.strftime("%Y-%m-%d"),),
-            ).fetchall()
+                (start_date,),
+            )
 
-            data["tasks"] = [Task.from_db_row(row).to_dict() for row in rows]
+            data["tasks"] = [
+                {
+                    "id": id_,
+                    "name": name,
+                    "done": bool(done),
+                    "date": date,
+                    "created_at": created_at,
+                }
+                for id_, name, done, date, created_at in rows
+            ]
 
             # Include completion history if requested
             if include_completions:
-                completion_rows = conn.execute(
-                    """
-                    SELECT * FROM habit_completions 
-                    WHERE date >= ? 
-                    ORDER BY date DESC
-                """,
-                    (start_date.strftime("%Y-%m-%d"),),
-                ).fetchall()
+                completion_rows = conn.execute(_SQL_COMPLETIONS_SINCE, (start_date,))
 
-                data["habit_completions"] = [
-                    HabitCompletion.from_db_row(row).__dict__ for row in completion_rows
-                ]
+                # Rows already carry the column names, so no dataclass detour
+                data["habit_completions"] = [dict(row) for row in completion_rows]
 
-        finally:
-            conn.close()
-
-        return json.dumps(data, indent=2, ensure_ascii=False)
+        # Compact output; indentation roughly doubled the export size
+        if orjson is not None:
+            return orjson.dumps(data).decode()
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
 
     @staticmethod
     def export_habits_csv() -> str:
         """Export habits to CSV format"""
-        habits = HabitManager.get_all_habits()
+        # ISO dates order as strings, so "active" (done today or yesterday)
+        # needs no per-row parsing
+        yesterday = (_date.today() - timedelta(days=1)).isoformat()
 
-        csv_lines = ["Name,Streak,Last Done,Created At,Status"]
+        with connection_pool.borrow() as conn:
+            rows = conn.execute(
+                """
+                SELECT name, streak, last_done, created_at
+                FROM habits ORDER BY created_at DESC
+            """
+            ).fetchall()
 
-        for habit in habits:
-            status = "Active" if habit.is_streak_active() else "Inactive"
-            csv_lines.append(
-                f'"{habit.name}",{habit.streak},"{habit.last_done or "Never"}","{habit.created_at}",{status}'
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(("Name", "Streak", "Last Done", "Created At", "Status"))
+        writer.writerows(
+            (
+                name,
+                streak,
+                last_done or "Never",
+                created_at,
+                "Active" if last_done and last_done >= yesterday else "Inactive",
             )
+            for name, streak, last_done, created_at in rows
+        )
 
-        return "\n".join(csv_lines)
+        return buffer.getvalue()
@@ -4,30 +4,17 @@
 // AI Service Functions
 async function loadAIInsights() {
     try {
-        // Load daily greeting first
-        const greeting = await apiCall('/ai/greeting');
+        // Greeting, insights and priorities are generated together on the server
+        const dashboard = await apiCall('/ai/dashboard');
         const greetingEl = document.getElementById('aiGreeting');
         if (greetingEl) {
-            greetingEl.innerHTML = `💡 ${greeting.message}`;
+            greetingEl.innerHTML = `💡 ${dashboard.greeting}`;
         }
-        
-        // Load additional insights with delays for better UX
-        setTimeout(async () => {
-            try {
-                const insights = await apiCall('/ai/insights');
-                const insightsEl = document.getElementById('aiInsights');
-                if (insightsEl) {
-                    insightsEl.innerHTML = `📊 ${insights.message}`;
-                }
-            } catch (e) {
-                console.log('AI insights not available');
-                // Fallback message
-                const insightsEl = document.getElementById('aiInsights');
-                if (insightsEl) {
-                    insightsEl.innerHTML = '📊 Great habits take time to build. Focus on consistency over perfection!';
-                }
-            }
-        }, 1000);
+        const insightsEl = document.getElementById('aiInsights');
+        if (insightsEl) {
+            insightsEl.innerHTML = `📊 ${dashboard.insights}`;
+        }
+        updateTaskPriorities(dashboard.prioritization);
         
         setTimeout(async () => {
             try {
@@ -48,18 +35,7 @@ async function loadAIInsights() {
                     descEl.textContent = 'Take 5 minutes before bed to reflect on your day and plan tomorrow\'s priorities.';
                 }
             }
-        }, 2000);
-        
-        // Load task prioritization
-        setTimeout(async () => {
-            try {
-                const priorities = await apiCall('/ai/prioritize');
-                updateTaskPriorities(priorities.message);
-            } catch (e) {
-                console.log('AI prioritization not available');
-                updateTaskPriorities('Focus on your most important task first - you\'ve got this! 📋');
-            }
-        }, 3000);
+        }, 1000);
         
     } catch (error) {
         // Fallback if AI service is completely unavailable
@@ -67,6 +43,11 @@ async function loadAIInsights() {
         if (greetingEl) {
             greetingEl.innerHTML = '🌟 Ready to build some amazing habits today?';
         }
+        const insightsEl = document.getElementById('aiInsights');
+        if (insightsEl) {
+            insightsEl.innerHTML = '📊 Great habits take time to build. Focus on consistency over perfection!';
+        }
+        updateTaskPriorities('Focus on your most important task first - you\'ve got this! 📋');
         console.log('AI service unavailable, using fallbacks');
     }
 }
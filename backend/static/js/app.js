@@ -93,21 +93,17 @@ async function apiCall(endpoint, method = 'GET', data = null) {
 // Data Loading
 async function loadData() {
     try {
-        const [habitsData, archivedData, tasksData, statsData] = await Promise.all([
-            apiCall('/habits'),
-            apiCall('/habits/archived'),
-            apiCall('/tasks'),
-            apiCall('/stats')
-        ]);
+        // One request for the whole dashboard instead of four
+        const snapshot = await apiCall('/today');
         
-        habits = habitsData;
-        archivedHabits = archivedData;
-        tasks = tasksData;
+        habits = snapshot.habits;
+        archivedHabits = snapshot.archived_habits;
+        tasks = snapshot.tasks;
         
         renderHabits();
         renderArchivedHabits();
         renderTasks();
-        updateStats(statsData);
+        updateStats(snapshot.stats);
 
         // Schedule local reminders
         scheduleAllReminders();
@@ -0,0 +1,5 @@
+import os
+
+# Run the suite against TestingConfig's in-memory database instead of the
+# on-disk development database
+os.environ["FLASK_ENV"] = "testing"
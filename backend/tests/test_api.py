@@ -0,0 +1,29 @@
+import pytest
+
+from app import create_app
+from database import reset_db
+from services import HabitService
+
+
+@pytest.fixture()
+def client():
+    # Ensure a clean database for each test
+    reset_db()
+    return create_app("testing").test_client()
+
+
+def test_habit_list_revalidates_with_etag(client):
+    first = client.get("/api/habits")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    cached = client.get("/api/habits", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.data == b""
+
+    HabitService.add_new_habit("Stretch")
+
+    changed = client.get("/api/habits", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert [h["name"] for h in changed.get_json()] == ["Stretch"]
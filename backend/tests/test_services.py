@@ -1,7 +1,9 @@
+from datetime import date, timedelta
+
 import pytest
 
-from database import reset_db
-from services import HabitService, TaskService
+from database import get_db_connection, init_db, reset_db
+from services import HabitService, TaskService, StatsService
 
 
 @pytest.fixture(autouse=True)
@@ -49,6 +51,27 @@ def test_tasks_flow_complete_uncomplete():
     assert error is None and ok2 is True
 
 
+def test_missing_task_does_not_leave_a_transaction_open():
+    ok, error = TaskService.complete_task_by_id(12345)
+    assert ok is False and error == "Task not found"
+    assert not get_db_connection().in_transaction
+
+    habit, _ = HabitService.add_new_habit("Floss")
+    result, error = HabitService.complete_habit_for_today(habit["id"])
+    assert error is None and result["success"] is True
+
+
+def test_done_today_follows_completions_not_last_done():
+    habit, _ = HabitService.add_new_habit("Walk")
+    conn = get_db_connection()
+    conn.execute("UPDATE habits SET last_done = date('now', 'localtime') WHERE id = ?", (habit["id"],))
+    conn.commit()
+
+    listed = next(h for h in HabitService.get_all_habits_with_status() if h["id"] == habit["id"])
+    assert listed["done_today"] is False
+    assert TaskService.get_dashboard_stats()["habits"]["done_today"] == 0
+
+
 def test_dashboard_stats_shape():
     # Seed some data
     HabitService.add_new_habit("Exercise")
@@ -60,3 +83,80 @@ def test_dashboard_stats_shape():
     assert set(stats["habits"].keys()) == {"total", "done_today", "completion_rate"}
     assert set(stats["tasks"].keys()) == {"total_today", "done_today", "completion_rate"}
     assert set(stats["streaks"].keys()) == {"best_streak", "active_streaks"}
+
+
+def test_deleting_habit_cascades_to_completions():
+    habit, _ = HabitService.add_new_habit("Stretch")
+    HabitService.complete_habit_for_today(habit["id"])
+
+    conn = get_db_connection()
+    try:
+        conn.execute("DELETE FROM habits WHERE id = ?", (habit["id"],))
+        conn.commit()
+        remaining = conn.execute(
+            "SELECT COUNT(*) FROM habit_completions WHERE habit_id = ?", (habit["id"],)
+        ).fetchone()[0]
+    finally:
+        conn.close()
+
+    assert remaining == 0
+
+
+@pytest.mark.parametrize(
+    "days_ago, expected_streak, expected_last_done",
+    [
+        ([0, 1, 2, 5], 2, 1),  # gap after the latest run
+        ([0, 3], 1, 3),  # a single remaining day
+        ([0], 0, None),  # nothing left
+    ],
+)
+def test_uncomplete_recomputes_streak_from_remaining_run(
+    days_ago, expected_streak, expected_last_done
+):
+    habit, _ = HabitService.add_new_habit("Meditate")
+    today = date.today()
+    conn = get_db_connection()
+    conn.executemany(
+        "INSERT INTO habit_completions (habit_id, date) VALUES (?, ?)",
+        [(habit["id"], (today - timedelta(days=n)).isoformat()) for n in days_ago],
+    )
+    conn.commit()
+
+    result, error = HabitService.uncomplete_habit_for_today(habit["id"])
+    assert error is None and result["new_streak"] == expected_streak
+
+    streak, last_done = conn.execute(
+        "SELECT streak, last_done FROM habits WHERE id = ?", (habit["id"],)
+    ).fetchone()
+    assert streak == expected_streak
+    assert last_done == (
+        None
+        if expected_last_done is None
+        else (today - timedelta(days=expected_last_done)).isoformat()
+    )
+
+
+def test_data_version_changes_on_writes():
+    v0 = StatsService.get_data_version()
+    habit, _ = HabitService.add_new_habit("Journal")
+    v1 = StatsService.get_data_version()
+    HabitService.complete_habit_for_today(habit["id"])
+    v2 = StatsService.get_data_version()
+
+    assert v0 < v1 < v2
+    assert StatsService.get_data_version() == v2
+
+
+def test_init_db_adds_missing_columns_to_older_databases():
+    conn = get_db_connection()
+    conn.execute("ALTER TABLE habits DROP COLUMN is_archived")
+    conn.execute("ALTER TABLE tasks DROP COLUMN reminder_time")
+    conn.execute("PRAGMA user_version = 0")
+    conn.commit()
+
+    init_db()
+
+    habit_columns = {r[1] for r in conn.execute("PRAGMA table_info(habits)")}
+    task_columns = {r[1] for r in conn.execute("PRAGMA table_info(tasks)")}
+    assert {"reminder_time", "is_archived"} <= habit_columns
+    assert "reminder_time" in task_columns